@@ -33,8 +33,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'weather.metrics.MetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'weather.middleware.APICompressionMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -86,6 +88,28 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Cache: locmem (default), file or redis
+_CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': config('CACHE_LOCATION', default=str(BASE_DIR / '.cache')),
+    },
+    'redis': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': config('REDIS_URL', default='redis://localhost:6379/0'),
+    },
+}
+CACHES = {
+    'default': _CACHE_BACKENDS[config('CACHE_BACKEND', default='locmem')],
+}
+# Seconds a cached API response is kept; entries are also versioned by DataSource.last_updated
+WEATHER_CACHE_TIMEOUT = config('WEATHER_CACHE_TIMEOUT', default=3600, cast=int)
+# Collect request, SQL, cache and ingestion metrics and serve them at /api/metrics/
+WEATHER_METRICS_ENABLED = config('WEATHER_METRICS_ENABLED', default=False, cast=bool)
+
 # CORS
 CORS_ALLOW_ALL_ORIGINS = True
 
@@ -108,4 +132,6 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Celery Configuration (for async tasks)
 CELERY_BROKER_URL = config('REDIS_URL', default='redis://localhost:6379/0')
-CELERY_RESULT_BACKEND = config('REDIS_URL', default='redis://localhost:6379/0')
\ No newline at end of file
+CELERY_RESULT_BACKEND = config('REDIS_URL', default='redis://localhost:6379/0')
+CELERY_TASK_ALWAYS_EAGER = config('CELERY_TASK_ALWAYS_EAGER', default=False, cast=bool)
+CELERY_TASK_EAGER_PROPAGATES = True
@@ -0,0 +1,25 @@
+"""
+Gunicorn settings, read automatically from the working directory.
+
+Each worker loads the weather series into its in-process store right after
+forking, so the first chart/summary requests do not pay for it.
+"""
+import os
+
+
+def post_fork(server, worker):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'farmsetu_weather_project.settings')
+
+    import django
+    django.setup()
+
+    from django.db import connections
+    from weather.store import store
+
+    try:
+        server.log.info(f"Worker {worker.pid}: loaded {store.warm()} weather series")
+    except Exception as e:
+        # The store loads lazily anyway, e.g. before the first migrate
+        server.log.warning(f"Worker {worker.pid}: could not warm the weather store: {e}")
+    finally:
+        connections.close_all()
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import WeatherRegion, WeatherParameter, WeatherData, DataSource
+from .models import WeatherRegion, WeatherParameter, WeatherData, DataSource, ParseJob
 
 @admin.register(WeatherRegion)
 class WeatherRegionAdmin(admin.ModelAdmin):
@@ -23,4 +23,10 @@ class WeatherDataAdmin(admin.ModelAdmin):
 class DataSourceAdmin(admin.ModelAdmin):
     list_display = ['region', 'parameter', 'last_updated', 'is_active']
     list_filter = ['is_active', 'last_updated']
-    search_fields = ['region__code', 'parameter__code']
\ No newline at end of file
+    search_fields = ['region__code', 'parameter__code']
+
+@admin.register(ParseJob)
+class ParseJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'status', 'total_pairs', 'created_at', 'finished_at']
+    list_filter = ['status']
+    readonly_fields = ['results']
@@ -0,0 +1,157 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .models import AgroclimateIndex, WeatherData
+
+# Parameters the indices are derived from
+AGROCLIMATE_INPUTS = ('Tmax', 'Tmin', 'Rainfall', 'Sunshine')
+
+# Base temperature of growing degree days in °C, the usual UK grass and
+# cereal threshold
+GDD_BASE = 5.5
+
+# Mean daily minimum in °C at or below which a month counts as frost-risk
+FROST_RISK_TMIN = 3.0
+
+# Index fields of AgroclimateIndex, in output order
+INDEX_FIELDS = ('gdd', 'frost_months', 'rain_sun_ratio', 'pet', 'water_balance')
+
+_MONTH_DAYS = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31], dtype=np.float64)
+
+
+def days_in_month(years: np.ndarray) -> np.ndarray:
+    """(years, 12) days of every month of the given years"""
+    leap = (years % 4 == 0) & ((years % 100 != 0) | (years % 400 == 0))
+    days = np.tile(_MONTH_DAYS, (len(years), 1))
+    days[leap, 1] = 29
+    return days
+
+
+def pivot_inputs(rows: Iterable[Tuple[int, str, int, int, float]]) -> Tuple[List[int], np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Pivot (region_id, parameter code, year, month, value) rows into aligned arrays.
+
+    Returns:
+        tuple: (region ids, years, {parameter code: (regions, years, 12)
+        array}), NaN where there is no data
+    """
+    rows = list(rows)
+    if not rows:
+        return [], np.empty(0, dtype=np.int64), {code: np.empty((0, 0, 12)) for code in AGROCLIMATE_INPUTS}
+    region_ids, codes, years, months, values = zip(*rows)
+    region_ids, region_index = np.unique(np.array(region_ids), return_inverse=True)
+    years = np.array(years, dtype=np.int64)
+    first_year = years.min()
+    all_years = np.arange(first_year, years.max() + 1)
+    codes, months, values = np.array(codes), np.array(months, dtype=np.int64), np.array(values, dtype=np.float64)
+
+    inputs = {}
+    for code in AGROCLIMATE_INPUTS:
+        selected = codes == code
+        matrix = np.full((len(region_ids), len(all_years), 12), np.nan)
+        matrix[region_index[selected], years[selected] - first_year, months[selected] - 1] = values[selected]
+        inputs[code] = matrix
+    return region_ids.tolist(), all_years, inputs
+
+
+def thornthwaite_pet(tmean: np.ndarray, days: np.ndarray) -> np.ndarray:
+    """
+    Monthly potential evapotranspiration in mm by Thornthwaite's method.
+
+    Uses a 12-hour day length, so it is a relative index rather than a
+    site-calibrated PET; a year's heat index needs all twelve months.
+    """
+    t = np.maximum(tmean, 0.0)
+    heat_index = ((t / 5) ** 1.514).sum(axis=-1, keepdims=True)
+    exponent = 6.75e-7 * heat_index ** 3 - 7.71e-5 * heat_index ** 2 + 1.792e-2 * heat_index + 0.49239
+    with np.errstate(invalid='ignore', divide='ignore'):
+        pet = np.where(t > 0, 16 * (10 * t / heat_index) ** exponent, 0.0)
+    return pet * days / 30
+
+
+def compute_indices(years: np.ndarray, inputs: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Annual indices of every region and year at once.
+
+    Args:
+        years: Calendar years of the second axis
+        inputs: (regions, years, 12) arrays keyed by AGROCLIMATE_INPUTS code
+
+    Returns:
+        dict: (regions, years) arrays keyed by INDEX_FIELDS; NaN for years
+        missing any month of the inputs an index needs
+    """
+    tmax, tmin, rain, sun = (inputs[code] for code in AGROCLIMATE_INPUTS)
+    days = days_in_month(years)
+    tmean = (tmax + tmin) / 2
+
+    # Full-year sums propagate NaN, so incomplete years drop out
+    gdd = (np.maximum(tmean - GDD_BASE, 0.0) * days).sum(axis=-1)
+    gdd[np.isnan(tmean).any(axis=-1)] = np.nan
+    frost_months = np.where(np.isnan(tmin).any(axis=-1), np.nan, (tmin <= FROST_RISK_TMIN).sum(axis=-1))
+    rain_total = rain.sum(axis=-1)
+    sun_total = sun.sum(axis=-1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rain_sun_ratio = np.where(sun_total > 0, rain_total / sun_total, np.nan)
+    pet = thornthwaite_pet(tmean, days).sum(axis=-1)
+    pet[np.isnan(tmean).any(axis=-1)] = np.nan
+    return {
+        'gdd': gdd,
+        'frost_months': frost_months,
+        'rain_sun_ratio': rain_sun_ratio,
+        'pet': pet,
+        'water_balance': rain_total - pet,
+    }
+
+
+def compute_agroclimate(rows: Iterable[Tuple[int, str, int, int, float]]) -> List[dict]:
+    """AgroclimateIndex field dictionaries from (region_id, parameter code, year, month, value) rows"""
+    region_ids, years, inputs = pivot_inputs(rows)
+    if not region_ids:
+        return []
+    indices = compute_indices(years, inputs)
+    stacked = np.stack([indices[field] for field in INDEX_FIELDS], axis=-1)
+    result = []
+    for region_position, year_position in zip(*np.nonzero(~np.isnan(stacked).all(axis=-1))):
+        values = stacked[region_position, year_position]
+        record = {
+            'region_id': region_ids[region_position],
+            'year': int(years[year_position]),
+            **{field: None if np.isnan(value) else float(value) for field, value in zip(INDEX_FIELDS, values)},
+        }
+        if record['frost_months'] is not None:
+            record['frost_months'] = int(record['frost_months'])
+        result.append(record)
+    return result
+
+
+def refresh_agroclimate(region_ids: Optional[Iterable[int]] = None, years: Optional[Iterable[int]] = None) -> int:
+    """
+    Recompute the AgroclimateIndex rows of the given regions and years (default all).
+
+    Indices are per calendar year, so a change to a month only affects its
+    own year. Reads every input series of those regions and years in one
+    query and replaces their rows in one delete and one bulk insert.
+
+    Returns:
+        int: Number of index rows written
+    """
+    data = WeatherData.objects.filter(parameter__code__in=AGROCLIMATE_INPUTS)
+    indices = AgroclimateIndex.objects.all()
+    if region_ids is not None:
+        region_ids = list(region_ids)
+        data = data.filter(region_id__in=region_ids)
+        indices = indices.filter(region_id__in=region_ids)
+    if years is not None:
+        years = set(years)
+        if not years:
+            return 0
+        data = data.filter(year__in=years)
+        indices = indices.filter(year__in=years)
+
+    records = compute_agroclimate(
+        data.order_by().values_list('region_id', 'parameter__code', 'year', 'month', 'value')
+    )
+    indices.delete()
+    return len(AgroclimateIndex.objects.bulk_create([AgroclimateIndex(**record) for record in records]))
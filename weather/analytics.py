@@ -0,0 +1,580 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .store import SeriesArrays
+
+# Default baseline period, the WMO 1961-1990 climate normal
+DEFAULT_BASELINE = (1961, 1990)
+
+# Default rolling windows in months
+DEFAULT_WINDOWS = (12, 36, 120)
+
+# Share of a rolling window that must hold data for the mean to be reported
+ROLLING_MIN_COVERAGE = 0.75
+
+
+def to_json_list(values: np.ndarray) -> List[Any]:
+    """Float list with None in place of NaN"""
+    return np.where(np.isnan(values), None, values).tolist()
+
+
+def to_json_float(value: float) -> Optional[float]:
+    """Float, or None for NaN"""
+    return None if np.isnan(value) else float(value)
+
+
+def monthly_climatology(arrays: SeriesArrays, baseline_from: int,
+                        baseline_to: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Per calendar month mean and sample standard deviation over the baseline years.
+
+    Returns:
+        tuple: (mean, std, count) arrays of length 12; mean is NaN for months
+        without baseline data and std for months with fewer than two values
+    """
+    start, end = arrays.window(baseline_from, baseline_to)
+    baseline = arrays.values[start:end].reshape(-1, 12)
+    present = ~np.isnan(baseline)
+    count = present.sum(axis=0)
+    filled = np.where(present, baseline, 0.0)
+
+    mean = np.full(12, np.nan)
+    np.divide(filled.sum(axis=0), count, out=mean, where=count > 0)
+    squares = np.where(present, (baseline - mean) ** 2, 0.0).sum(axis=0)
+    std = np.full(12, np.nan)
+    np.sqrt(np.divide(squares, count - 1, out=std, where=count > 1), out=std, where=count > 1)
+    return mean, std, count
+
+
+def rolling_mean(values: np.ndarray, window: int, min_coverage: float = ROLLING_MIN_COVERAGE) -> np.ndarray:
+    """
+    Trailing rolling mean over window months, ignoring NaN.
+
+    Computed from cumulative sums in one pass. A month gets NaN until
+    window months have passed or when less than min_coverage of its window
+    holds data.
+    """
+    present = ~np.isnan(values)
+    sums = np.concatenate(([0.0], np.cumsum(np.where(present, values, 0.0))))
+    counts = np.concatenate(([0], np.cumsum(present)))
+    result = np.full(len(values), np.nan)
+    if window > len(values):
+        return result
+    window_sums = sums[window:] - sums[:-window]
+    window_counts = counts[window:] - counts[:-window]
+    enough = window_counts >= max(1, int(np.ceil(window * min_coverage)))
+    np.divide(window_sums, window_counts, out=result[window - 1:], where=enough)
+    return result
+
+
+def anomaly_series(arrays: Optional[SeriesArrays], baseline: Tuple[int, int] = DEFAULT_BASELINE,
+                   windows: Iterable[int] = DEFAULT_WINDOWS, year_from: Optional[int] = None,
+                   year_to: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Anomalies of a monthly series against its baseline climatology.
+
+    Args:
+        arrays: The series from the store, None for a series without data
+        baseline: (first, last) year of the baseline period
+        windows: Rolling-mean windows in months, applied to the anomalies
+        year_from: First year to return; rolling means still see earlier months
+        year_to: Last year to return
+
+    Returns:
+        dict: start_year and start_month of the returned months, their
+        values, anomalies, z_scores (anomaly over the baseline standard
+        deviation of the calendar month) and rolling anomaly means keyed by
+        window, plus the baseline climatology. Gaps are None.
+    """
+    if arrays is None:
+        arrays = SeriesArrays(baseline[0], np.empty(0))
+    mean, std, count = monthly_climatology(arrays, *baseline)
+    calendar_month = np.arange(len(arrays.values)) % 12
+    anomalies = arrays.values - mean[calendar_month]
+    z_scores = np.full(len(anomalies), np.nan)
+    month_std = std[calendar_month]
+    np.divide(anomalies, month_std, out=z_scores, where=~np.isnan(month_std) & (month_std > 0))
+    rolling = {window: rolling_mean(anomalies, window) for window in windows}
+
+    result = {
+        'baseline': {
+            'year_from': baseline[0],
+            'year_to': baseline[1],
+            'mean': to_json_list(mean),
+            'std': to_json_list(std),
+            'count': count.tolist(),
+        },
+        'start_year': None,
+        'start_month': None,
+        'values': [],
+        'anomalies': [],
+        'z_scores': [],
+        'rolling': {str(window): [] for window in windows},
+    }
+    present = arrays.present(year_from, year_to)
+    if not len(present):
+        return result
+
+    first, last = int(present[0]), int(present[-1]) + 1
+    result.update(
+        start_year=arrays.start_year + first // 12,
+        start_month=first % 12 + 1,
+        values=to_json_list(arrays.values[first:last]),
+        anomalies=to_json_list(anomalies[first:last]),
+        z_scores=to_json_list(z_scores[first:last]),
+        rolling={str(window): to_json_list(means[first:last]) for window, means in rolling.items()},
+    )
+    return result
+
+
+# Trend periods: the twelve calendar months, then the seasons as in the
+# MetOffice table (winter is Dec-Feb, labelled with the year of its January)
+MONTH_PERIODS = ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec')
+TREND_PERIODS = MONTH_PERIODS + ('win', 'spr', 'sum', 'aut', 'ann')
+
+# Fewest years on either side of a change point
+CHANGE_POINT_MIN_SEGMENT = 5
+
+
+def period_matrix(arrays: SeriesArrays, year_from: Optional[int] = None,
+                  year_to: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    One row per year and one column per TREND_PERIODS entry.
+
+    Seasonal and annual columns are means over complete seasons only, so a
+    single missing month makes that year's season NaN.
+
+    Returns:
+        tuple: (years, matrix) with matrix of shape (len(years), 17)
+    """
+    months = arrays.values.reshape(-1, 12)
+    previous_december = np.concatenate(([np.nan], months[:-1, 11]))[:len(months)]
+    seasons = np.column_stack((
+        np.column_stack((previous_december, months[:, 0], months[:, 1])).mean(axis=1),
+        months[:, 2:5].mean(axis=1),
+        months[:, 5:8].mean(axis=1),
+        months[:, 8:11].mean(axis=1),
+        months.mean(axis=1),
+    ))
+    matrix = np.column_stack((months, seasons))
+    start, end = arrays.window(year_from, year_to)
+    years = arrays.start_year + np.arange(start // 12, end // 12)
+    return years, matrix[start // 12:end // 12]
+
+
+def fit_trends(years: np.ndarray, matrix: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Least-squares line through every column of matrix against years, ignoring NaN.
+
+    The 2x2 normal equations of all columns are stacked and solved in one
+    np.linalg.solve call. Columns with fewer than three values get NaN.
+
+    Returns:
+        dict: Arrays with one entry per column: 'slope' (per year),
+        'intercept' (value at year 0), 'r_squared', 'stderr' (of the slope)
+        and 'n'
+    """
+    present = ~np.isnan(matrix)
+    weights = present.astype(np.float64)
+    y = np.where(present, matrix, 0.0)
+    x = (years - years.mean() if len(years) else years).astype(np.float64)[:, None]
+
+    n = weights.sum(axis=0)
+    sx = (weights * x).sum(axis=0)
+    sxx = (weights * x * x).sum(axis=0)
+    sy = y.sum(axis=0)
+    sxy = (y * x).sum(axis=0)
+
+    fitted = (n >= 3) & (n * sxx - sx * sx > 0)
+    normal = np.empty((matrix.shape[1], 2, 2))
+    normal[:, 0, 0], normal[:, 0, 1], normal[:, 1, 0], normal[:, 1, 1] = n, sx, sx, sxx
+    normal[~fitted] = np.eye(2)
+    rhs = np.column_stack((sy, sxy))
+    rhs[~fitted] = 0.0
+    intercept, slope = np.linalg.solve(normal, rhs[..., None])[..., 0].T
+
+    residuals = np.where(present, matrix - (intercept + slope * x), 0.0)
+    sse = (residuals ** 2).sum(axis=0)
+    mean_y = np.divide(sy, n, out=np.zeros_like(sy), where=n > 0)
+    sst = np.where(present, (matrix - mean_y) ** 2, 0.0).sum(axis=0)
+    x_spread = sxx - np.divide(sx * sx, n, out=np.zeros_like(sx), where=n > 0)
+
+    r_squared = np.full(len(n), np.nan)
+    np.subtract(1.0, np.divide(sse, sst, out=np.zeros_like(sse), where=sst > 0), out=r_squared, where=fitted & (sst > 0))
+    stderr = np.full(len(n), np.nan)
+    np.sqrt(np.divide(sse / np.maximum(n - 2, 1), x_spread, out=stderr, where=fitted), out=stderr, where=fitted)
+
+    slope = np.where(fitted, slope, np.nan)
+    offset = years.mean() if len(years) else 0.0
+    return {
+        'slope': slope,
+        'intercept': np.where(fitted, intercept - slope * offset, np.nan),
+        'r_squared': r_squared,
+        'stderr': stderr,
+        'n': n.astype(np.int64),
+    }
+
+
+def rolling_trends(years: np.ndarray, matrix: np.ndarray, window: int,
+                   min_coverage: float = ROLLING_MIN_COVERAGE) -> np.ndarray:
+    """
+    Slope per year of every column over each trailing window of years.
+
+    Sliding sums come from cumulative sums, so all windows and columns are
+    fitted at once.
+
+    Returns:
+        np.ndarray: Shape (len(years) - window + 1, columns), row i for the
+        window ending at years[i + window - 1]; NaN where the window holds
+        too few values
+    """
+    if window > len(years):
+        return np.empty((0, matrix.shape[1]))
+    present = ~np.isnan(matrix)
+    weights = present.astype(np.float64)
+    y = np.where(present, matrix, 0.0)
+    x = (years - years[0]).astype(np.float64)[:, None]
+
+    def sliding(values):
+        sums = np.concatenate((np.zeros((1, values.shape[1])), np.cumsum(values, axis=0)))
+        return sums[window:] - sums[:-window]
+
+    n, sx, sxx = sliding(weights), sliding(weights * x), sliding(weights * x * x)
+    sy, sxy = sliding(y), sliding(y * x)
+    denominator = n * sxx - sx * sx
+    slopes = np.full(n.shape, np.nan)
+    enough = (n >= max(3, int(np.ceil(window * min_coverage)))) & (denominator > 0)
+    np.divide(n * sxy - sx * sy, denominator, out=slopes, where=enough)
+    return slopes
+
+
+def change_points(years: np.ndarray, matrix: np.ndarray,
+                  min_segment: int = CHANGE_POINT_MIN_SEGMENT) -> List[Optional[Dict[str, Any]]]:
+    """
+    Single mean-shift change point per column.
+
+    Every split of a column's values into a before and an after segment of
+    at least min_segment values is scored with the two-sample t statistic
+    (pooled variance) of their means; the split with the largest |t| wins.
+    All splits of all columns are scored in one vectorized pass.
+
+    Returns:
+        list: Per column None, or a dict with 'year' (first year of the
+        after segment), 'mean_before', 'mean_after', 'shift' and 't_statistic'
+    """
+    if not len(years):
+        return [None] * matrix.shape[1]
+    present = ~np.isnan(matrix)
+    y = np.where(present, matrix, 0.0)
+    count = np.cumsum(present, axis=0)
+    total = np.cumsum(y, axis=0)
+    squares = np.cumsum(y * y, axis=0)
+    n, sum_all, sq_all = count[-1], total[-1], squares[-1]
+
+    # Split before row k: the before segment is rows [0, k)
+    n1 = np.vstack((np.zeros((1, matrix.shape[1])), count[:-1]))
+    s1 = np.vstack((np.zeros((1, matrix.shape[1])), total[:-1]))
+    q1 = np.vstack((np.zeros((1, matrix.shape[1])), squares[:-1]))
+    n2, s2, q2 = n - n1, sum_all - s1, sq_all - q1
+
+    valid = (n1 >= min_segment) & (n2 >= min_segment) & present
+    safe1, safe2 = np.maximum(n1, 1), np.maximum(n2, 1)
+    mean1, mean2 = s1 / safe1, s2 / safe2
+    pooled = ((q1 - s1 * mean1) + (q2 - s2 * mean2)) / np.maximum(n - 2, 1)
+    spread = np.sqrt(np.maximum(pooled, 0) * (1 / safe1 + 1 / safe2))
+    t_statistic = np.zeros_like(mean1)
+    np.divide(mean2 - mean1, spread, out=t_statistic, where=valid & (spread > 0))
+
+    best = np.abs(t_statistic).argmax(axis=0)
+    results = []
+    for column, row in enumerate(best):
+        if not valid[row, column] or t_statistic[row, column] == 0:
+            results.append(None)
+            continue
+        results.append({
+            'year': int(years[row]),
+            'mean_before': float(mean1[row, column]),
+            'mean_after': float(mean2[row, column]),
+            'shift': float(mean2[row, column] - mean1[row, column]),
+            't_statistic': float(t_statistic[row, column]),
+        })
+    return results
+
+
+def trend_report(arrays: Optional[SeriesArrays], year_from: Optional[int] = None,
+                 year_to: Optional[int] = None, rolling_window: Optional[int] = None,
+                 detect_change_points: bool = False) -> Dict[str, Any]:
+    """
+    Per-month and per-season trends of a series, for the trends endpoint.
+
+    Args:
+        arrays: The series from the store, None for a series without data
+        year_from: First year of the fit
+        year_to: Last year of the fit
+        rolling_window: Also fit every trailing window of this many years
+        detect_change_points: Also look for one mean shift per period
+
+    Returns:
+        dict: 'periods' with slope_per_decade, slope, intercept, r_squared,
+        stderr and n per TREND_PERIODS key, and when requested 'rolling'
+        and 'change_points'
+    """
+    if arrays is None:
+        arrays = SeriesArrays(0, np.empty(0))
+    years, matrix = period_matrix(arrays, year_from, year_to)
+    fits = fit_trends(years, matrix)
+
+    report = {
+        'year_from': int(years[0]) if len(years) else None,
+        'year_to': int(years[-1]) if len(years) else None,
+        'periods': {
+            period: {
+                'slope_per_decade': to_json_float(fits['slope'][i] * 10),
+                'slope': to_json_float(fits['slope'][i]),
+                'intercept': to_json_float(fits['intercept'][i]),
+                'r_squared': to_json_float(fits['r_squared'][i]),
+                'stderr': to_json_float(fits['stderr'][i]),
+                'n': int(fits['n'][i]),
+            }
+            for i, period in enumerate(TREND_PERIODS)
+        },
+    }
+    if rolling_window:
+        slopes = rolling_trends(years, matrix, rolling_window)
+        report['rolling'] = {
+            'window': rolling_window,
+            'end_years': years[rolling_window - 1:].tolist() if len(slopes) else [],
+            'slope_per_decade': {
+                period: to_json_list(slopes[:, i] * 10) for i, period in enumerate(TREND_PERIODS)
+            },
+        }
+    if detect_change_points:
+        report['change_points'] = dict(zip(TREND_PERIODS, change_points(years, matrix)))
+    return report
+
+
+def region_matrix(series: Dict[str, Optional[SeriesArrays]], year_from: Optional[int] = None,
+                  year_to: Optional[int] = None) -> Tuple[Optional[int], np.ndarray]:
+    """
+    Pivot several regions' series into one aligned region x month array.
+
+    Args:
+        series: Arrays keyed by region code, in row order; None for no data
+        year_from: First year of the window
+        year_to: Last year of the window
+
+    Returns:
+        tuple: (start_year, matrix) where matrix[r, i] is month i from
+        January of start_year for the r-th region, NaN where missing; whole
+        years only, start_year None when no region has data in the window
+    """
+    loaded = [arrays for arrays in series.values() if arrays is not None]
+    if not loaded:
+        return None, np.empty((len(series), 0))
+    first = min(arrays.start_year for arrays in loaded)
+    last = max(arrays.start_year + len(arrays.values) // 12 - 1 for arrays in loaded)
+    if year_from is not None:
+        first = max(first, year_from)
+    if year_to is not None:
+        last = min(last, year_to)
+    if first > last:
+        return None, np.empty((len(series), 0))
+
+    matrix = np.full((len(series), (last - first + 1) * 12), np.nan)
+    for row, arrays in enumerate(series.values()):
+        if arrays is None:
+            continue
+        start, end = arrays.window(first, last)
+        offset = (arrays.start_year * 12 + start) - first * 12
+        matrix[row, offset:offset + end - start] = arrays.values[start:end]
+    return first, matrix
+
+
+def deseasonalize(matrix: np.ndarray) -> np.ndarray:
+    """Subtract each row's own mean of each calendar month"""
+    by_month = matrix.reshape(len(matrix), -1, 12)
+    present = ~np.isnan(by_month)
+    counts = present.sum(axis=1)
+    means = np.full(counts.shape, np.nan)
+    np.divide(np.where(present, by_month, 0.0).sum(axis=1), counts, out=means, where=counts > 0)
+    return (by_month - means[:, None, :]).reshape(matrix.shape)
+
+
+def lagged_comparison(matrix: np.ndarray, lag: int = 0, min_overlap: int = 3) -> Dict[str, np.ndarray]:
+    """
+    Pairwise correlation and mean difference between the rows of matrix.
+
+    Entry [i, j] pairs row i at month t with row j at month t - lag, over
+    the months where both hold data. All pairs come out of a handful of
+    masked matrix products.
+
+    Returns:
+        dict: 'correlation', 'mean_difference' (row i minus row j) and
+        'overlap' (months used) as rows x rows arrays; NaN where the overlap
+        is below min_overlap or a row is constant
+    """
+    months = matrix.shape[1]
+    lagged = np.full(matrix.shape, np.nan)
+    if abs(lag) < months:
+        if lag >= 0:
+            lagged[:, lag:] = matrix[:, :months - lag]
+        else:
+            lagged[:, :lag] = matrix[:, -lag:]
+
+    present_x, present_y = ~np.isnan(matrix), ~np.isnan(lagged)
+    mask_x, mask_y = present_x.astype(np.float64), present_y.astype(np.float64)
+    x, y = np.where(present_x, matrix, 0.0), np.where(present_y, lagged, 0.0)
+
+    overlap = mask_x @ mask_y.T
+    sum_x, sum_y = x @ mask_y.T, mask_x @ y.T
+    sum_xx, sum_yy, sum_xy = (x * x) @ mask_y.T, mask_x @ (y * y).T, x @ y.T
+
+    enough = overlap >= min_overlap
+    safe = np.where(enough, overlap, 1.0)
+    covariance = sum_xy - sum_x * sum_y / safe
+    variance_x = sum_xx - sum_x * sum_x / safe
+    variance_y = sum_yy - sum_y * sum_y / safe
+    denominator = np.sqrt(np.maximum(variance_x, 0) * np.maximum(variance_y, 0))
+
+    correlation = np.full(overlap.shape, np.nan)
+    np.divide(covariance, denominator, out=correlation, where=enough & (denominator > 0))
+    np.clip(correlation, -1.0, 1.0, out=correlation)
+    mean_difference = np.full(overlap.shape, np.nan)
+    np.divide(sum_x - sum_y, overlap, out=mean_difference, where=enough)
+    return {
+        'correlation': correlation,
+        'mean_difference': mean_difference,
+        'overlap': overlap.astype(np.int64),
+    }
+
+
+def region_comparison(series: Dict[str, Optional[SeriesArrays]], year_from: Optional[int] = None,
+                      year_to: Optional[int] = None, lag: int = 0, anomalies: bool = False,
+                      include_series: bool = True) -> Dict[str, Any]:
+    """
+    Aligned multi-region matrix and pairwise statistics for the compare endpoint.
+
+    Args:
+        series: Arrays keyed by region code, in output order
+        year_from: First year of the window
+        year_to: Last year of the window
+        lag: Months by which the column region trails the row region
+        anomalies: Compare deviations from each region's monthly means
+            instead of raw values, which removes the shared seasonal cycle
+        include_series: Include the aligned values matrix
+
+    Returns:
+        dict: regions, start_year, start_month, lag, anomalies, and
+        correlation, mean_difference and overlap matrices (row region
+        first), plus values when include_series
+    """
+    start_year, matrix = region_matrix(series, year_from, year_to)
+    if anomalies and matrix.size:
+        matrix = deseasonalize(matrix)
+    stats = lagged_comparison(matrix, lag)
+
+    result = {
+        'regions': list(series),
+        'start_year': start_year,
+        'start_month': 1 if start_year is not None else None,
+        'lag': lag,
+        'anomalies': anomalies,
+        'correlation': [to_json_list(row) for row in stats['correlation']],
+        'mean_difference': [to_json_list(row) for row in stats['mean_difference']],
+        'overlap': stats['overlap'].tolist(),
+    }
+    if include_series:
+        result['values'] = [to_json_list(row) for row in matrix]
+    return result
+
+
+def rank_values(ordered: np.ndarray, values: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Rank values against an ascending record by binary search.
+
+    Ties share the best rank, and the percentile counts tied values as
+    half below, so the median of the record sits at 50.
+
+    Returns:
+        dict: 'rank' (1 = highest), 'rank_ascending' (1 = lowest) and
+        'percentile' arrays, NaN/0 throughout for an empty record
+    """
+    below = np.searchsorted(ordered, values, side='left')
+    at_or_below = np.searchsorted(ordered, values, side='right')
+    count = len(ordered)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        percentile = (below + at_or_below) / 2 / count * 100
+    return {
+        'rank': count - at_or_below + 1,
+        'rank_ascending': below + 1,
+        'percentile': percentile,
+    }
+
+
+def _records(ordered: np.ndarray, years: np.ndarray, positions: np.ndarray) -> List[Dict[str, Any]]:
+    values = ordered[positions]
+    ranks = rank_values(ordered, values)
+    return [
+        {'year': int(year), 'value': float(value), 'rank': int(rank), 'rank_ascending': int(rank_ascending)}
+        for year, value, rank, rank_ascending in zip(
+            years[positions], values, ranks['rank'], ranks['rank_ascending']
+        )
+    ]
+
+
+def rank_report(arrays: Optional[SeriesArrays], month: Optional[int] = None, year: Optional[int] = None,
+                value: Optional[float] = None, top: int = 3) -> Dict[str, Any]:
+    """
+    Where one month sits in the record of its calendar month, for the rank endpoint.
+
+    Args:
+        arrays: The series from the store, None for a series without data
+        month: Calendar month 1-12; defaults to the month of the latest value
+        year: Rank the value of this year's month
+        value: Rank an arbitrary value instead of a stored one
+        top: Number of highest and lowest records to list
+
+    Returns:
+        dict: month, count, first_year, last_year, the ranked target (year,
+        value, rank, rank_ascending, percentile; latest month of the series
+        when neither year nor value is given) and the highest and lowest
+        records
+    """
+    if arrays is None:
+        arrays = SeriesArrays(0, np.empty(0))
+    if year is None and value is None:
+        present = arrays.present()
+        if month is not None:
+            present = present[present % 12 == month - 1]
+        if len(present):
+            year, month = arrays.start_year + int(present[-1]) // 12, int(present[-1]) % 12 + 1
+
+    if month is None:
+        ordered, years = np.empty(0), np.empty(0, dtype=np.int64)
+    else:
+        ordered, years = arrays.month_index[month - 1]
+    if value is None and year is not None:
+        offset = (year - arrays.start_year) * 12 + month - 1
+        if 0 <= offset < len(arrays.values) and not np.isnan(arrays.values[offset]):
+            value = float(arrays.values[offset])
+
+    target = {'year': year, 'value': value, 'rank': None, 'rank_ascending': None, 'percentile': None}
+    if value is not None and len(ordered):
+        ranks = rank_values(ordered, np.array([value]))
+        target.update({
+            'rank': int(ranks['rank'][0]),
+            'rank_ascending': int(ranks['rank_ascending'][0]),
+            'percentile': float(ranks['percentile'][0]),
+        })
+
+    top = min(top, len(ordered))
+    return {
+        'month': month,
+        'count': len(ordered),
+        'first_year': int(years.min()) if len(years) else None,
+        'last_year': int(years.max()) if len(years) else None,
+        'target': target,
+        'highest': _records(ordered, years, np.arange(len(ordered) - 1, len(ordered) - 1 - top, -1)),
+        'lowest': _records(ordered, years, np.arange(top)),
+    }
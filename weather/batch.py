@@ -0,0 +1,131 @@
+from collections import defaultdict
+from typing import Any, Dict, List
+
+import numpy as np
+from django.db.models import Q
+
+from .fastpath import metadata
+from .models import WeatherData, WeatherRollup
+from .renderers import columnar_series
+
+# Aggregations served from the monthly table and from the rollup table
+MONTHLY_AGGREGATIONS = ('monthly', 'climatology')
+ROLLUP_AGGREGATIONS = ('annual', 'seasonal')
+SERIES_AGGREGATIONS = MONTHLY_AGGREGATIONS + ROLLUP_AGGREGATIONS
+
+SEASONS = ('win', 'spr', 'sum', 'aut')
+
+# Most specs accepted in one batch request
+MAX_BATCH_SERIES = 20
+
+
+def _spec_filter(spec: Dict[str, Any]) -> Q:
+    condition = Q(region_id=spec['region_id'], parameter_id=spec['parameter_id'])
+    if spec.get('year_from') is not None:
+        condition &= Q(year__gte=spec['year_from'])
+    if spec.get('year_to') is not None:
+        condition &= Q(year__lte=spec['year_to'])
+    return condition
+
+
+def _in_range(spec: Dict[str, Any], year: int) -> bool:
+    return ((spec.get('year_from') is None or year >= spec['year_from'])
+            and (spec.get('year_to') is None or year <= spec['year_to']))
+
+
+def _grouped_rows(model, fields, specs) -> Dict[tuple, list]:
+    """Run one query covering every spec and group the rows by (region_id, parameter_id)"""
+    grouped = defaultdict(list)
+    if not specs:
+        return grouped
+    condition = Q()
+    for spec in specs:
+        condition |= _spec_filter(spec)
+    for row in model.objects.filter(condition).order_by().values_list('region_id', 'parameter_id', *fields):
+        grouped[row[:2]].append(row[2:])
+    return grouped
+
+
+def _yearly(rows) -> Dict[str, Any]:
+    """Dense per-year values from (year, value) pairs"""
+    if not rows:
+        return {'start_year': None, 'values': []}
+    start = min(year for year, _ in rows)
+    values = [None] * (max(year for year, _ in rows) - start + 1)
+    for year, value in rows:
+        values[year - start] = value
+    return {'start_year': start, 'values': values}
+
+
+def _climatology(rows) -> List[Any]:
+    """Mean value of each calendar month over the rows"""
+    if not rows:
+        return [None] * 12
+    table = np.array(rows, dtype=np.float64)
+    months = table[:, 1].astype(np.int64) - 1
+    counts = np.bincount(months, minlength=12)
+    sums = np.bincount(months, weights=table[:, 2], minlength=12)
+    return [float(sums[i] / counts[i]) if counts[i] else None for i in range(12)]
+
+
+def load_series(specs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Resolve a batch of series specs with one grouped query per source table.
+
+    Monthly and climatology specs share one WeatherData query, annual and
+    seasonal specs one WeatherRollup query; both OR together the
+    region/parameter/year-range filters of their specs.
+
+    Args:
+        specs: Validated specs with region, parameter, region_id,
+            parameter_id, year_from, year_to and aggregation, and for
+            monthly specs optionally max_points and downsample
+
+    Returns:
+        list: One series dictionary per spec, in request order
+    """
+    monthly_specs = [spec for spec in specs if spec['aggregation'] in MONTHLY_AGGREGATIONS]
+    rollup_specs = [spec for spec in specs if spec['aggregation'] in ROLLUP_AGGREGATIONS]
+    monthly = _grouped_rows(WeatherData, ('year', 'month', 'value'), monthly_specs)
+    rollups = _grouped_rows(WeatherRollup, ('year', 'season', 'mean_value'), rollup_specs)
+    _, parameters = metadata.tables()
+
+    results = []
+    for spec in specs:
+        key = (spec['region_id'], spec['parameter_id'])
+        aggregation = spec['aggregation']
+        series = {
+            'region': spec['region'],
+            'parameter': spec['parameter'],
+            'unit': parameters[spec['parameter_id']][2],
+            'year_from': spec.get('year_from'),
+            'year_to': spec.get('year_to'),
+            'aggregation': aggregation,
+        }
+        if aggregation in MONTHLY_AGGREGATIONS:
+            rows = [row for row in monthly[key] if _in_range(spec, row[0])]
+            if aggregation == 'monthly':
+                dense = columnar_series(
+                    spec['region'], spec['parameter'], rows, spec.get('max_points'), spec.get('downsample', 'lttb')
+                )
+                series.update((field, value) for field, value in dense.items() if field not in ('region', 'parameter'))
+            else:
+                series['values'] = _climatology(rows)
+        else:
+            rows = [row for row in rollups[key] if _in_range(spec, row[0])]
+            if aggregation == 'annual':
+                series.update(_yearly([(year, value) for year, season, value in rows if season == 'ann']))
+            else:
+                by_season = {
+                    season: _yearly([(year, value) for year, row_season, value in rows if row_season == season])
+                    for season in SEASONS
+                }
+                starts = [dense['start_year'] for dense in by_season.values() if dense['start_year'] is not None]
+                series['start_year'] = min(starts) if starts else None
+                series['seasons'] = {
+                    season: [None] * (dense['start_year'] - series['start_year']) + dense['values']
+                    if dense['start_year'] is not None else []
+                    for season, dense in by_season.items()
+                }
+        results.append(series)
+    return results
@@ -0,0 +1,236 @@
+import math
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from django.db import connection
+
+from .models import WeatherData, WeatherRegion, WeatherRollup, DataSource
+from .fastpath import WEATHER_DATA_VALUES, serialize_weather_rows
+from .parsers import MetOfficeParser, SEASONAL_COLUMNS
+from .serializers import WeatherDataSerializer
+
+MONTH_COLUMNS = ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec')
+
+
+def synthetic_metoffice_file(years: int, start_year: int = 1000, missing_rate: float = 0.01, seed: int = 0) -> str:
+    """
+    Build a MetOffice-format data file with the given number of years.
+    
+    Args:
+        years (int): Number of data rows
+        start_year (int): First year; keep >= 1000 so rows start with 4 digits
+        missing_rate (float): Fraction of cells written as '---'
+        seed (int): Random seed, so runs are reproducible
+    
+    Returns:
+        str: File content including the usual header lines
+    """
+    rng = random.Random(seed)
+    lines = [
+        'Synthetic Mean daily temperature (Degrees C)',
+        f'Areal series, starting from {start_year}',
+        'Last updated 01-Jan-2024 09:00',
+        'year ' + ' '.join(f'{column:>6}' for column in MONTH_COLUMNS + SEASONAL_COLUMNS),
+    ]
+    for year in range(start_year, start_year + years):
+        cells = [
+            '   ---' if rng.random() < missing_rate else f'{rng.uniform(-5, 25):6.1f}'
+            for _ in range(len(MONTH_COLUMNS) + len(SEASONAL_COLUMNS))
+        ]
+        lines.append(f'{year:4d} ' + ' '.join(cells))
+    return '\n'.join(lines) + '\n'
+
+
+def _best_of(func: Callable[[], Any], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def compare_parsers(years: int = 10000, repeat: int = 3) -> Dict[str, Any]:
+    """
+    Time parse_data_content against the vectorized parse_table.
+    
+    Usage:
+        python manage.py shell -c "from weather.benchmarks import compare_parsers; print(compare_parsers())"
+    
+    Returns:
+        dict: Best-of-repeat seconds for each parser and the speedup
+    """
+    parser = MetOfficeParser()
+    content = synthetic_metoffice_file(years)
+    
+    line_parser = _best_of(lambda: parser.parse_data_content(content), repeat)
+    table_parser = _best_of(lambda: parser.parse_table(content), repeat)
+    table_records = _best_of(lambda: parser.table_to_records(parser.parse_table(content)), repeat)
+    
+    return {
+        'years': years,
+        'parse_data_content_s': round(line_parser, 4),
+        'parse_table_s': round(table_parser, 4),
+        'parse_table_records_s': round(table_records, 4),
+        'speedup': round(line_parser / table_parser, 1) if table_parser else None,
+    }
+
+
+def _result(stage: str, seconds: float, rows: int, **extra) -> Dict[str, Any]:
+    return {
+        'stage': stage,
+        'seconds': round(seconds, 4),
+        'rows': rows,
+        'rows_per_s': round(rows / seconds) if seconds else None,
+        **extra,
+    }
+
+
+def _synthetic_regions(count: int) -> Dict[str, str]:
+    return {f'SYN{index:03d}': f'Synthetic region {index}' for index in range(count)}
+
+
+def _clear_weather_tables():
+    WeatherData.objects.all().delete()
+    WeatherRollup.objects.all().delete()
+    DataSource.objects.all().delete()
+
+
+def bench_parse(years: int, repeat: int = 3) -> Dict[str, Any]:
+    """Time parse_data_content on one synthetic file"""
+    parser = MetOfficeParser()
+    content = synthetic_metoffice_file(years)
+    rows = len(parser.parse_data_content(content))
+    seconds = _best_of(lambda: parser.parse_data_content(content), repeat)
+    return _result('parse_data_content', seconds, rows, years=years, bytes=len(content))
+
+
+def bench_save(years: int) -> List[Dict[str, Any]]:
+    """Time save_weather_data for a cold insert and an unchanged re-save of one series"""
+    parser = MetOfficeParser()
+    parser.REGIONS = _synthetic_regions(1)
+    parser.initialize_regions_and_parameters()
+    region_code = next(iter(parser.REGIONS))
+    parsed_data = parser.parse_data_content(synthetic_metoffice_file(years))
+    
+    _clear_weather_tables()
+    start = time.perf_counter()
+    parser.save_weather_data(region_code, 'Tmean', parsed_data)
+    insert = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    parser.save_weather_data(region_code, 'Tmean', parsed_data)
+    resave = time.perf_counter() - start
+    _clear_weather_tables()
+    
+    return [
+        _result('save_weather_data_insert', insert, len(parsed_data), years=years),
+        _result('save_weather_data_unchanged', resave, len(parsed_data), years=years),
+    ]
+
+
+def bench_parse_all(series: int, years: int, workers: int = 1) -> List[Dict[str, Any]]:
+    """
+    Time parse_all_data end to end over a synthetic mirror.
+    
+    The mirror holds ceil(series / 5) synthetic regions for every parameter.
+    The second run measures the unchanged path, where every file is skipped
+    on its stored validators.
+    """
+    region_count = math.ceil(series / len(MetOfficeParser.PARAMETERS))
+    results = []
+    with tempfile.TemporaryDirectory() as root:
+        parser = MetOfficeParser(source=root)
+        parser.REGIONS = _synthetic_regions(region_count)
+        for index, parameter_code in enumerate(parser.PARAMETERS):
+            for region_index, region_code in enumerate(parser.REGIONS):
+                path = Path(root) / parser.get_data_path(region_code, parameter_code)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(synthetic_metoffice_file(years, seed=index * region_count + region_index))
+        
+        _clear_weather_tables()
+        for stage in ('parse_all_data', 'parse_all_data_unchanged'):
+            start = time.perf_counter()
+            pair_results = parser.parse_all_data(workers=workers)
+            seconds = time.perf_counter() - start
+            failures = [r for r in pair_results if not r['success']]
+            if failures:
+                raise RuntimeError(f"Benchmark ingestion failed: {failures[0]['message']}")
+            results.append(_result(
+                stage, seconds, sum(r['total_records'] for r in pair_results),
+                series=len(pair_results), years=years, workers=workers,
+            ))
+        _clear_weather_tables()
+    
+    return results
+
+
+def bench_weather_data_reads(rows: int, repeat: int = 3) -> List[Dict[str, Any]]:
+    """Time WeatherDataSerializer against the .values() fast path for one page of rows"""
+    parser = MetOfficeParser()
+    parser.REGIONS = _synthetic_regions(1)
+    parser.initialize_regions_and_parameters()
+    region_code = next(iter(parser.REGIONS))
+    parser.save_weather_data(
+        region_code, 'Tmean', parser.parse_data_content(synthetic_metoffice_file(math.ceil(rows / 12) + 1))
+    )
+    queryset = WeatherData.objects.order_by('-year', '-month')
+    
+    serializer = _best_of(lambda: WeatherDataSerializer(
+        list(queryset.select_related('region', 'parameter')[:rows]), many=True
+    ).data, repeat)
+    fast = _best_of(lambda: serialize_weather_rows(queryset.values(*WEATHER_DATA_VALUES)[:rows]), repeat)
+    _clear_weather_tables()
+    
+    return [
+        _result('weather_data_serializer', serializer, rows),
+        _result('weather_data_fast_rows', fast, rows, speedup=round(serializer / fast, 1) if fast else None),
+    ]
+
+
+def run_ingest_benchmarks(years: List[int], series: List[int], series_years: int = 150,
+                          workers: int = 1, repeat: int = 3, read_rows: List[int] = ()) -> Dict[str, Any]:
+    """
+    Run the parse, save and end-to-end ingestion benchmarks.
+    
+    Writes into the current database connection, so callers should point it
+    at a throwaway database (the benchmark_ingest command does this).
+    
+    Args:
+        years: File sizes, in years, for the parse and save stages
+        series: Series counts for the end-to-end parse_all_data stage
+        series_years: Years per file in the end-to-end stage
+        workers: parse_all_data worker count
+        repeat: Repetitions for the parse and read stages, best one reported
+        read_rows: Page sizes for the WeatherData read serialization stage
+    
+    Returns:
+        dict: Environment details and a flat list of stage results
+    """
+    results = []
+    for year_count in years:
+        results.append(bench_parse(year_count, repeat))
+        results.extend(bench_save(year_count))
+    for series_count in series:
+        results.extend(bench_parse_all(series_count, series_years, workers))
+    for row_count in read_rows:
+        results.extend(bench_weather_data_reads(row_count, repeat))
+    
+    WeatherRegion.objects.filter(code__startswith='SYN').delete()
+    
+    return {
+        'database': _database_info(),
+        'results': results,
+    }
+
+
+def _database_info() -> Dict[str, Any]:
+    info = {'vendor': connection.vendor, 'alias': connection.alias}
+    if connection.vendor == 'sqlite':
+        info['version'] = connection.Database.sqlite_version
+    elif connection.vendor == 'postgresql':
+        info['version'] = connection.pg_version
+    return info
@@ -0,0 +1,79 @@
+import hashlib
+from typing import Any, Callable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Max
+from django.utils.cache import patch_cache_control
+from django.utils.http import http_date, parse_http_date_safe
+from rest_framework import status
+from rest_framework.response import Response
+
+from .metrics import record_cache
+from .models import DataSource
+
+
+def series_last_updated(region: Optional[str], parameter: Optional[str]):
+    """Latest DataSource.last_updated for the series a request reads, None if never ingested"""
+    sources = DataSource.objects.all()
+    if region:
+        sources = sources.filter(region__code=region)
+    if parameter:
+        sources = sources.filter(parameter__code=parameter)
+    return sources.aggregate(last_updated=Max('last_updated'))['last_updated']
+
+
+def _not_modified(request, etag: str, last_modified: int) -> bool:
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match is not None:
+        return if_none_match.strip() == '*' or etag in [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+    if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+    return if_modified_since is not None and last_modified <= if_modified_since
+
+
+def cached_response(request, endpoint: str, region: Optional[str], parameter: Optional[str],
+                    build: Callable[[], Any], key: Any = None) -> Response:
+    """
+    Serve a read endpoint from the cache, keyed on the data version.
+    
+    The key covers the endpoint, region, parameter, query parameters and
+    negotiated format, and is versioned by the series' DataSource.last_updated,
+    so a successful save_weather_data invalidates exactly the affected series.
+    Responses carry a strong ETag and Last-Modified and conditional requests
+    get a 304. Series that were never ingested are not cached.
+    
+    key is folded into the cache key for requests whose input is not in the
+    query string (e.g. a POSTed batch); region/parameter None version the
+    response on every series.
+    """
+    last_updated = series_last_updated(region, parameter)
+    if last_updated is None:
+        record_cache(endpoint, 'uncached')
+        return Response(build())
+    
+    params = sorted((key, tuple(values)) for key, values in request.GET.lists())
+    renderer = getattr(getattr(request, 'accepted_renderer', None), 'format', '')
+    digest = hashlib.sha256(
+        repr((endpoint, region, parameter, params, renderer, key, last_updated.isoformat())).encode()
+    ).hexdigest()
+    etag = f'"{digest[:32]}"'
+    last_modified = int(last_updated.timestamp())
+    
+    if request.method in ('GET', 'HEAD') and _not_modified(request, etag, last_modified):
+        record_cache(endpoint, 'not_modified')
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        cache_key = f'weather:{endpoint}:{digest}'
+        data = cache.get(cache_key)
+        if data is None:
+            record_cache(endpoint, 'miss')
+            data = build()
+            cache.set(cache_key, data, settings.WEATHER_CACHE_TIMEOUT)
+        else:
+            record_cache(endpoint, 'hit')
+        response = Response(data)
+    
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    patch_cache_control(response, public=True, max_age=0, must_revalidate=True)
+    return response
@@ -0,0 +1,78 @@
+import numpy as np
+
+
+def lttb(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets point selection.
+
+    The first and last points are always kept; the points between are split
+    into max_points - 2 buckets and from each bucket the point forming the
+    largest triangle with the previously kept point and the mean of the next
+    bucket is chosen. Bucket means and triangle areas are computed with
+    array operations; only the walk over buckets is sequential, since each
+    choice depends on the previous one.
+
+    Args:
+        x: Increasing x coordinates
+        y: Values at x, without NaNs
+        max_points: Number of points to keep, at least 3
+
+    Returns:
+        np.ndarray: Sorted indices of the kept points
+    """
+    n = len(x)
+    if max_points >= n or max_points < 3:
+        return np.arange(n)
+
+    # Bucket edges over the interior points 1 .. n-2
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.int64)
+    starts, ends = edges[:-1], edges[1:]
+    sums_x = np.add.reduceat(x[1:n - 1], starts - 1)
+    sums_y = np.add.reduceat(y[1:n - 1], starts - 1)
+    sizes = ends - starts
+    mean_x = np.append(sums_x / sizes, x[-1])[1:]
+    mean_y = np.append(sums_y / sizes, y[-1])[1:]
+
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for bucket, (start, end) in enumerate(zip(starts, ends)):
+        bx, by = x[start:end], y[start:end]
+        area = np.abs((x[a] - mean_x[bucket]) * (by - y[a]) - (x[a] - bx) * (mean_y[bucket] - y[a]))
+        a = start + int(area.argmax())
+        selected[bucket + 1] = a
+    return selected
+
+
+def minmax(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Keep the minimum and maximum of each of max_points // 2 buckets.
+
+    Fully vectorized: points are ordered by (bucket, value) once and the
+    first and last point of every bucket are taken.
+
+    Args:
+        x: Increasing x coordinates
+        y: Values at x, without NaNs
+        max_points: Upper bound on the number of points kept
+
+    Returns:
+        np.ndarray: Sorted indices of the kept points
+    """
+    n = len(x)
+    buckets = max_points // 2
+    if max_points >= n or buckets < 1:
+        return np.arange(n)
+
+    bucket = np.arange(n) * buckets // n
+    order = np.lexsort((y, bucket))
+    boundaries = np.flatnonzero(np.diff(bucket[order])) + 1
+    lowest = order[np.concatenate(([0], boundaries))]
+    highest = order[np.concatenate((boundaries - 1, [n - 1]))]
+    return np.unique(np.concatenate((lowest, highest)))
+
+
+DOWNSAMPLERS = {
+    'lttb': lttb,
+    'minmax': minmax,
+}
@@ -0,0 +1,60 @@
+import csv
+import json
+from itertools import islice
+from typing import Any, Dict, Iterator, List
+
+from .fastpath import WEATHER_DATA_VALUES, serialize_weather_rows
+
+# Rows fetched per round trip; on PostgreSQL this is the server-side cursor
+# fetch size, so memory stays bounded whatever the export size
+EXPORT_CHUNK_SIZE = 2000
+
+# Columns of an export row, the WeatherDataSerializer fields
+EXPORT_FIELDS = (
+    'id', 'region', 'region_name', 'region_code',
+    'parameter', 'parameter_name', 'parameter_code', 'parameter_unit',
+    'year', 'month', 'value', 'created_at', 'updated_at',
+)
+
+
+class _Echo:
+    """File-like object whose write() hands the line back to csv.writer's caller"""
+
+    def write(self, value):
+        return value
+
+
+def iter_export_chunks(queryset, chunk_size: int = None) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Serialized rows of a WeatherData queryset, chunk_size rows at a time.
+
+    Reads through QuerySet.iterator(), which uses a server-side cursor on
+    PostgreSQL, and never holds more than one chunk in memory.
+    """
+    chunk_size = chunk_size or EXPORT_CHUNK_SIZE
+    rows = queryset.values(*WEATHER_DATA_VALUES).iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield serialize_weather_rows(chunk)
+
+
+def stream_csv(queryset, chunk_size: int = None) -> Iterator[str]:
+    """CSV with a header line, one string per chunk"""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for chunk in iter_export_chunks(queryset, chunk_size):
+        yield ''.join(writer.writerow([row[field] for field in EXPORT_FIELDS]) for row in chunk)
+
+
+def stream_ndjson(queryset, chunk_size: int = None) -> Iterator[str]:
+    """Newline-delimited JSON, one object per row and one string per chunk"""
+    for chunk in iter_export_chunks(queryset, chunk_size):
+        yield ''.join(json.dumps(row) + '\n' for row in chunk)
+
+
+EXPORT_STREAMS = {
+    'csv': stream_csv,
+    'ndjson': stream_ndjson,
+}
@@ -0,0 +1,116 @@
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.db.models.signals import post_delete, post_save
+from rest_framework import serializers
+
+from .models import WeatherParameter, WeatherRegion
+
+# Columns read with .values() for the serializer-free WeatherData path
+WEATHER_DATA_VALUES = (
+    'id', 'region_id', 'parameter_id', 'year', 'month', 'value', 'created_at', 'updated_at',
+)
+
+
+class MetadataLookup:
+    """
+    Process-local id -> metadata tables for regions and parameters.
+    
+    Loaded on first use and reloaded whenever an unknown id is seen or a
+    region/parameter is saved or deleted, so rows never need a join.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._regions = None
+        self._parameters = None
+    
+    def invalidate(self, **kwargs):
+        with self._lock:
+            self._regions = self._parameters = None
+    
+    def _load(self):
+        regions = {
+            pk: (name, code)
+            for pk, name, code in WeatherRegion.objects.values_list('pk', 'name', 'code')
+        }
+        parameters = {
+            pk: (name, code, unit)
+            for pk, name, code, unit in WeatherParameter.objects.values_list('pk', 'name', 'code', 'unit')
+        }
+        with self._lock:
+            self._regions, self._parameters = regions, parameters
+        return regions, parameters
+    
+    def tables(self, rows: Iterable[Dict[str, Any]] = ()):
+        regions, parameters = self._regions, self._parameters
+        if regions is None or parameters is None or any(
+            row['region_id'] not in regions or row['parameter_id'] not in parameters for row in rows
+        ):
+            regions, parameters = self._load()
+        return regions, parameters
+
+    def ids(self, region_code: Optional[str], parameter_code: Optional[str]):
+        """(region pk, parameter pk) for a pair of codes, None for codes that are None or do not exist"""
+        regions, parameters = self.tables()
+        for attempt in range(2):
+            region_pk = next((pk for pk, (_, code) in regions.items() if code == region_code), None)
+            parameter_pk = next((pk for pk, (_, code, _) in parameters.items() if code == parameter_code), None)
+            if attempt or ((region_code is None or region_pk is not None)
+                           and (parameter_code is None or parameter_pk is not None)):
+                break
+            regions, parameters = self._load()
+        return region_pk, parameter_pk
+
+
+metadata = MetadataLookup()
+for _model in (WeatherRegion, WeatherParameter):
+    post_save.connect(metadata.invalidate, sender=_model, dispatch_uid=f'fastpath-{_model.__name__}-save')
+    post_delete.connect(metadata.invalidate, sender=_model, dispatch_uid=f'fastpath-{_model.__name__}-delete')
+
+_datetime = serializers.DateTimeField()
+
+
+def serialize_weather_rows(rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Build WeatherDataSerializer-shaped dictionaries from .values() rows.
+    
+    Args:
+        rows: Dictionaries with the WEATHER_DATA_VALUES keys
+    
+    Returns:
+        list: Rows with exactly the fields and order of WeatherDataSerializer
+    """
+    rows = list(rows)
+    regions, parameters = metadata.tables(rows)
+    
+    # Bulk upserts stamp whole batches with one timestamp, so format each
+    # distinct datetime once
+    datetimes = {}
+    
+    def to_datetime(value):
+        formatted = datetimes.get(value)
+        if formatted is None:
+            formatted = datetimes[value] = _datetime.to_representation(value)
+        return formatted
+    
+    result = []
+    for row in rows:
+        region_name, region_code = regions[row['region_id']]
+        parameter_name, parameter_code, parameter_unit = parameters[row['parameter_id']]
+        result.append({
+            'id': row['id'],
+            'region': row['region_id'],
+            'region_name': region_name,
+            'region_code': region_code,
+            'parameter': row['parameter_id'],
+            'parameter_name': parameter_name,
+            'parameter_code': parameter_code,
+            'parameter_unit': parameter_unit,
+            'year': row['year'],
+            'month': row['month'],
+            'value': row['value'],
+            'created_at': to_datetime(row['created_at']),
+            'updated_at': to_datetime(row['updated_at']),
+        })
+    return result
@@ -1,5 +1,5 @@
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from weather.parsers import MetOfficeParser
 
 class Command(BaseCommand):
@@ -8,16 +8,28 @@ class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument('--region', type=str, help='Specific region to parse')
         parser.add_argument('--parameter', type=str, help='Specific parameter to parse')
+        parser.add_argument('--workers', type=int, default=1, help='Number of concurrent downloads when parsing all data')
+        parser.add_argument(
+            '--source', type=str,
+            help='HTTP base URL, mirror directory or zip/tar archive to read the dataset tree from'
+        )
+        parser.add_argument('--force', action='store_true', help='Re-ingest files even if unchanged upstream')
     
     def handle(self, *args, **options):
-        parser = MetOfficeParser()
+        source = options.get('source')
+        try:
+            parser = MetOfficeParser(source=source)
+        except ValueError as e:
+            raise CommandError(str(e))
+        if source:
+            self.stdout.write(f'Reading dataset from {source}')
         
         region = options.get('region')
         parameter = options.get('parameter')
         
         if region and parameter:
             self.stdout.write(f'Parsing data for {region} - {parameter}...')
-            result = parser.parse_and_save(region, parameter)
+            result = parser.parse_and_save(region, parameter, force=options['force'])
             
             if result['success']:
                 self.stdout.write(
@@ -28,15 +40,18 @@ class Command(BaseCommand):
                     self.style.ERROR(result['message'])
                 )
         else:
-            self.stdout.write('Parsing all weather data...')
-            results = parser.parse_all_data()
+            workers = options.get('workers') or 1
+            self.stdout.write(f'Parsing all weather data with {workers} worker(s)...')
+            results = parser.parse_all_data(workers=workers, force=options['force'])
             
             success_count = sum(1 for r in results if r['success'])
+            unchanged_count = sum(1 for r in results if r.get('unchanged'))
             total_count = len(results)
             
             self.stdout.write(
                 self.style.SUCCESS(
-                    f'Completed parsing. {success_count}/{total_count} operations successful.'
+                    f'Completed parsing. {success_count}/{total_count} operations successful, '
+                    f'{unchanged_count} unchanged upstream.'
                 )
             )
             
@@ -0,0 +1,220 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack, contextmanager
+from typing import Dict, List, Sequence, Tuple
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+# Content type of the Prometheus text exposition format
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+INGEST_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def metrics_enabled() -> bool:
+    return getattr(settings, 'WEATHER_METRICS_ENABLED', False)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Counter:
+    """Monotonic counter per label combination"""
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name, self.documentation, self.labelnames = name, documentation, tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: Tuple[str, ...] = (), amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = dict(self._values)
+        return [
+            f'{self.name}{_format_labels(self.labelnames, labels)} {_format_number(value)}'
+            for labels, value in sorted(values.items())
+        ]
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label combination"""
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name, self.documentation, self.labelnames = name, documentation, tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (last one is +Inf), sum]
+        self._values: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, labels: Tuple[str, ...] = ()) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = {labels: (list(counts), total) for labels, (counts, total) in self._values.items()}
+        lines = []
+        for labels, (counts, total) in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else _format_number(bound)
+                bucket_labels = _format_labels(self.labelnames, labels, f'le="{le}"')
+                lines.append(f'{self.name}_bucket{bucket_labels} {cumulative}')
+            lines.append(f'{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_number(total)}')
+            lines.append(f'{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}')
+        return lines
+
+
+class Registry:
+    """
+    Process-local metric families rendered in the Prometheus text format.
+
+    Every gunicorn worker and Celery process keeps its own values, so
+    scrape each process (or aggregate by instance) rather than a load
+    balancer address.
+    """
+
+    def __init__(self):
+        self._families = []
+
+    def register(self, family):
+        self._families.append(family)
+        return family
+
+    def clear(self) -> None:
+        for family in self._families:
+            with family._lock:
+                family._values.clear()
+
+    def render(self) -> str:
+        lines = []
+        for family in self._families:
+            lines.append(f'# HELP {family.name} {family.documentation}')
+            lines.append(f'# TYPE {family.name} {family.kind}')
+            lines.extend(family.samples())
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+REQUESTS = registry.register(Counter(
+    'weather_http_requests_total', 'HTTP requests by route, method and status', ('route', 'method', 'status')
+))
+REQUEST_LATENCY = registry.register(Histogram(
+    'weather_http_request_duration_seconds', 'Time to produce the response by route', ('route', 'method')
+))
+RESPONSE_SIZE = registry.register(Histogram(
+    'weather_http_response_size_bytes', 'Response body size on the wire by route (not streamed bodies)',
+    ('route',), SIZE_BUCKETS
+))
+QUERY_COUNT = registry.register(Histogram(
+    'weather_db_queries_per_request', 'SQL queries executed per request by route', ('route',), QUERY_COUNT_BUCKETS
+))
+QUERY_TIME = registry.register(Counter(
+    'weather_db_query_duration_seconds_total', 'Time spent executing SQL by route', ('route',)
+))
+CACHE_REQUESTS = registry.register(Counter(
+    'weather_cache_requests_total',
+    'Cached endpoint lookups by result (hit, miss, not_modified, uncached)', ('endpoint', 'result')
+))
+INGEST_STAGE = registry.register(Histogram(
+    'weather_ingest_stage_duration_seconds', 'Ingestion stage timings per series file',
+    ('stage', 'parameter'), INGEST_BUCKETS
+))
+
+
+class QueryStats:
+    """connection.execute_wrapper that counts and times the queries it sees"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+def record_cache(endpoint: str, result: str) -> None:
+    if metrics_enabled():
+        CACHE_REQUESTS.inc((endpoint, result))
+
+
+@contextmanager
+def ingest_stage(stage: str, parameter: str):
+    """Time one fetch/parse/save stage of an ingestion into INGEST_STAGE"""
+    if not metrics_enabled():
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        INGEST_STAGE.observe(time.perf_counter() - start, (stage, parameter))
+
+
+class MetricsMiddleware:
+    """
+    Record latency, status, response size and SQL count/time per route.
+
+    The route is the URL pattern name, so ids in paths do not explode the
+    label space. Not loaded at all unless WEATHER_METRICS_ENABLED is set.
+    """
+
+    def __init__(self, get_response):
+        if not metrics_enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = QueryStats()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(queries))
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - start
+
+        match = getattr(request, 'resolver_match', None)
+        route = match.view_name if match is not None else 'unmatched'
+        REQUESTS.inc((route, request.method, str(response.status_code)))
+        REQUEST_LATENCY.observe(elapsed, (route, request.method))
+        if not response.streaming:
+            RESPONSE_SIZE.observe(len(response.content), (route,))
+        QUERY_COUNT.observe(queries.count, (route,))
+        QUERY_TIME.inc((route,), queries.duration)
+        return response
@@ -0,0 +1,89 @@
+from django.utils.cache import patch_vary_headers
+from django.utils.regex_helper import _lazy_re_compile
+from django.utils.text import compress_sequence, compress_string
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional, gzip is always offered
+    brotli = None
+
+_CODING_RE = _lazy_re_compile(r'^\s*([\w*-]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?\s*$')
+
+# Bodies smaller than this are not worth the compression overhead
+MIN_COMPRESS_LENGTH = 200
+
+
+def _accepted_codings(header: str) -> dict:
+    codings = {}
+    for part in header.split(','):
+        match = _CODING_RE.match(part)
+        if match:
+            codings[match.group(1).lower()] = float(match.group(2) or 1)
+    return codings
+
+
+def negotiate_encoding(header: str):
+    """Pick 'br' or 'gzip' from an Accept-Encoding header, None if neither is acceptable"""
+    codings = _accepted_codings(header or '')
+    offered = ['br', 'gzip'] if brotli is not None else ['gzip']
+    ranked = [(codings.get(coding, codings.get('*', 0)), -i, coding) for i, coding in enumerate(offered)]
+    quality, _, coding = max(ranked)
+    return coding if quality > 0 else None
+
+
+def _brotli_sequence(sequence):
+    compressor = brotli.Compressor(quality=5)
+    for item in sequence:
+        data = compressor.process(item)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+class APICompressionMiddleware:
+    """
+    Compress /api/ responses with brotli or gzip, as negotiated by Accept-Encoding.
+
+    Only API paths are compressed; the HTML pages carry CSRF tokens and are
+    left alone (BREACH). Strong ETags are weakened like GZipMiddleware does,
+    so conditional requests keep working across encodings.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not request.path.startswith('/api/'):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if response.has_header('Content-Encoding') or response.status_code == 304:
+            return response
+        if not response.streaming and len(response.content) < MIN_COMPRESS_LENGTH:
+            return response
+
+        coding = negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if coding is None:
+            return response
+
+        if response.streaming:
+            if coding == 'br':
+                response.streaming_content = _brotli_sequence(response.streaming_content)
+            else:
+                response.streaming_content = compress_sequence(response.streaming_content)
+            del response['Content-Length']
+        else:
+            if coding == 'br':
+                compressed = brotli.compress(response.content, quality=5)
+            else:
+                compressed = compress_string(response.content)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = coding
+        return response
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-18 01:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('weather', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='datasource',
+            name='content_hash',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='datasource',
+            name='etag',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='datasource',
+            name='last_modified',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-18 01:06
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('weather', '0002_datasource_validators'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ParseJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('completed', 'Completed')], default='pending', max_length=20)),
+                ('force', models.BooleanField(default=False)),
+                ('total_pairs', models.PositiveIntegerField(default=0)),
+                ('results', models.JSONField(blank=True, default=list)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,89 @@
+# Generated by Django 4.2.7 on 2026-10-18 01:09
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# Frozen copy of weather.rollups as of this migration, so later changes to
+# the live module do not change what the backfill computes
+SEASON_MONTHS = {
+    'win': ((-1, 12), (0, 1), (0, 2)),
+    'spr': ((0, 3), (0, 4), (0, 5)),
+    'sum': ((0, 6), (0, 7), (0, 8)),
+    'aut': ((0, 9), (0, 10), (0, 11)),
+    'ann': tuple((0, month) for month in range(1, 13)),
+}
+
+
+def compute_rollups(values, years):
+    """Season statistics for the given years from a (year, month) -> value map"""
+    rollups = []
+    for year in sorted(years):
+        for season, months in SEASON_MONTHS.items():
+            season_values = [
+                values[(year + offset, month)]
+                for offset, month in months
+                if (year + offset, month) in values
+            ]
+            if not season_values:
+                continue
+            total = sum(season_values)
+            rollups.append({
+                'year': year,
+                'season': season,
+                'count': len(season_values),
+                'min_value': min(season_values),
+                'max_value': max(season_values),
+                'mean_value': total / len(season_values),
+                'sum_value': total,
+            })
+    return rollups
+
+
+def build_rollups(apps, schema_editor):
+    """Backfill rollups for every series already in the database"""
+    WeatherData = apps.get_model('weather', 'WeatherData')
+    WeatherRollup = apps.get_model('weather', 'WeatherRollup')
+    
+    series = WeatherData.objects.order_by().values_list('region_id', 'parameter_id').distinct()
+    for region_id, parameter_id in series:
+        values = {
+            (year, month): value
+            for year, month, value in WeatherData.objects.filter(
+                region_id=region_id, parameter_id=parameter_id
+            ).order_by().values_list('year', 'month', 'value')
+        }
+        years = {year for year, _ in values} | {year + 1 for year, month in values if month == 12}
+        WeatherRollup.objects.bulk_create([
+            WeatherRollup(region_id=region_id, parameter_id=parameter_id, **rollup)
+            for rollup in compute_rollups(values, years)
+        ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('weather', '0003_parsejob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WeatherRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.IntegerField()),
+                ('season', models.CharField(choices=[('win', 'Winter'), ('spr', 'Spring'), ('sum', 'Summer'), ('aut', 'Autumn'), ('ann', 'Annual')], max_length=3)),
+                ('count', models.PositiveSmallIntegerField()),
+                ('min_value', models.FloatField()),
+                ('max_value', models.FloatField()),
+                ('mean_value', models.FloatField()),
+                ('sum_value', models.FloatField()),
+                ('parameter', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='weather.weatherparameter')),
+                ('region', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='weather.weatherregion')),
+            ],
+            options={
+                'unique_together': {('region', 'parameter', 'season', 'year')},
+            },
+        ),
+        migrations.RunPython(build_rollups, migrations.RunPython.noop),
+    ]
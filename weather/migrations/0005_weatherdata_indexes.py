@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-18 01:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('weather', '0004_weatherrollup'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='weatherdata',
+            options={},
+        ),
+        migrations.AddIndex(
+            model_name='weatherdata',
+            index=models.Index(fields=['region', 'parameter', 'year', 'month', 'value'], name='weather_series_cover_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='weatherdata',
+            index=models.Index(fields=['year', 'month', 'region', 'parameter'], name='weather_year_month_idx'),
+        ),
+    ]
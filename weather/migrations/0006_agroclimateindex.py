@@ -0,0 +1,112 @@
+# Generated by Django 4.2.7 on 2026-10-18 01:32
+
+from django.db import migrations, models
+import django.db.models.deletion
+import numpy as np
+
+
+# Frozen copy of weather.agroclimate as of this migration, so later changes
+# to the live module do not change what the backfill computes
+AGROCLIMATE_INPUTS = ('Tmax', 'Tmin', 'Rainfall', 'Sunshine')
+GDD_BASE = 5.5
+FROST_RISK_TMIN = 3.0
+INDEX_FIELDS = ('gdd', 'frost_months', 'rain_sun_ratio', 'pet', 'water_balance')
+MONTH_DAYS = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31], dtype=np.float64)
+
+
+def compute_agroclimate(rows):
+    """AgroclimateIndex field dictionaries from (region_id, parameter code, year, month, value) rows"""
+    rows = list(rows)
+    if not rows:
+        return []
+    region_ids, codes, years, months, values = zip(*rows)
+    region_ids, region_index = np.unique(np.array(region_ids), return_inverse=True)
+    years = np.array(years, dtype=np.int64)
+    first_year = years.min()
+    all_years = np.arange(first_year, years.max() + 1)
+    codes, months, values = np.array(codes), np.array(months, dtype=np.int64), np.array(values, dtype=np.float64)
+
+    inputs = []
+    for code in AGROCLIMATE_INPUTS:
+        selected = codes == code
+        matrix = np.full((len(region_ids), len(all_years), 12), np.nan)
+        matrix[region_index[selected], years[selected] - first_year, months[selected] - 1] = values[selected]
+        inputs.append(matrix)
+    tmax, tmin, rain, sun = inputs
+
+    leap = (all_years % 4 == 0) & ((all_years % 100 != 0) | (all_years % 400 == 0))
+    days = np.tile(MONTH_DAYS, (len(all_years), 1))
+    days[leap, 1] = 29
+    tmean = (tmax + tmin) / 2
+    incomplete = np.isnan(tmean).any(axis=-1)
+
+    gdd = (np.maximum(tmean - GDD_BASE, 0.0) * days).sum(axis=-1)
+    gdd[incomplete] = np.nan
+    frost_months = np.where(np.isnan(tmin).any(axis=-1), np.nan, (tmin <= FROST_RISK_TMIN).sum(axis=-1))
+    rain_total = rain.sum(axis=-1)
+    sun_total = sun.sum(axis=-1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rain_sun_ratio = np.where(sun_total > 0, rain_total / sun_total, np.nan)
+
+    # Thornthwaite PET with a 12-hour day length
+    t = np.maximum(tmean, 0.0)
+    heat_index = ((t / 5) ** 1.514).sum(axis=-1, keepdims=True)
+    exponent = 6.75e-7 * heat_index ** 3 - 7.71e-5 * heat_index ** 2 + 1.792e-2 * heat_index + 0.49239
+    with np.errstate(invalid='ignore', divide='ignore'):
+        monthly_pet = np.where(t > 0, 16 * (10 * t / heat_index) ** exponent, 0.0)
+    pet = (monthly_pet * days / 30).sum(axis=-1)
+    pet[incomplete] = np.nan
+
+    stacked = np.stack([gdd, frost_months, rain_sun_ratio, pet, rain_total - pet], axis=-1)
+    result = []
+    for region_position, year_position in zip(*np.nonzero(~np.isnan(stacked).all(axis=-1))):
+        record = {
+            'region_id': region_ids[region_position].item(),
+            'year': int(all_years[year_position]),
+            **{
+                field: None if np.isnan(value) else float(value)
+                for field, value in zip(INDEX_FIELDS, stacked[region_position, year_position])
+            },
+        }
+        if record['frost_months'] is not None:
+            record['frost_months'] = int(record['frost_months'])
+        result.append(record)
+    return result
+
+
+def build_agroclimate(apps, schema_editor):
+    """Backfill indices for every region already in the database"""
+    WeatherData = apps.get_model('weather', 'WeatherData')
+    AgroclimateIndex = apps.get_model('weather', 'AgroclimateIndex')
+    
+    rows = WeatherData.objects.filter(parameter__code__in=AGROCLIMATE_INPUTS).order_by().values_list(
+        'region_id', 'parameter__code', 'year', 'month', 'value'
+    )
+    AgroclimateIndex.objects.bulk_create([AgroclimateIndex(**record) for record in compute_agroclimate(rows)])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('weather', '0005_weatherdata_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AgroclimateIndex',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.IntegerField()),
+                ('gdd', models.FloatField(null=True)),
+                ('frost_months', models.PositiveSmallIntegerField(null=True)),
+                ('rain_sun_ratio', models.FloatField(null=True)),
+                ('pet', models.FloatField(null=True)),
+                ('water_balance', models.FloatField(null=True)),
+                ('region', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='weather.weatherregion')),
+            ],
+            options={
+                'unique_together': {('region', 'year')},
+            },
+        ),
+        migrations.RunPython(build_agroclimate, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-18 01:45
+
+import uuid
+
+from django.db import migrations, models
+
+
+def create_generation(apps, schema_editor):
+    StoreGeneration = apps.get_model('weather', 'StoreGeneration')
+    StoreGeneration.objects.create(pk=1, token=uuid.uuid4().hex)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('weather', '0006_agroclimateindex'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoreGeneration',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=32)),
+            ],
+        ),
+        migrations.RunPython(create_generation, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,5 @@
+import uuid
+
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
 
@@ -40,11 +42,73 @@ class WeatherData(models.Model):
     
     class Meta:
         unique_together = ['region', 'parameter', 'year', 'month']
-        ordering = ['-year', '-month']
+        # No default ordering: callers that need rows in date order ask for
+        # it, and counts/aggregates skip the sort.
+        indexes = [
+            # Series reads (chart data, delta diff, exports) are answered from
+            # the index alone because value is the trailing column
+            models.Index(fields=['region', 'parameter', 'year', 'month', 'value'], name='weather_series_cover_idx'),
+            # Year-range filters across series and the keyset list ordering
+            models.Index(fields=['year', 'month', 'region', 'parameter'], name='weather_year_month_idx'),
+        ]
     
     def __str__(self):
         return f"{self.region.code} - {self.parameter.code} - {self.year}/{self.month:02d}: {self.value}"
 
+class WeatherRollup(models.Model):
+    """Per-year seasonal and annual statistics, refreshed whenever a series is saved"""
+    SEASON_CHOICES = [
+        ('win', 'Winter'),
+        ('spr', 'Spring'),
+        ('sum', 'Summer'),
+        ('aut', 'Autumn'),
+        ('ann', 'Annual'),
+    ]
+    
+    region = models.ForeignKey(WeatherRegion, on_delete=models.CASCADE)
+    parameter = models.ForeignKey(WeatherParameter, on_delete=models.CASCADE)
+    year = models.IntegerField()
+    season = models.CharField(max_length=3, choices=SEASON_CHOICES)
+    count = models.PositiveSmallIntegerField()
+    min_value = models.FloatField()
+    max_value = models.FloatField()
+    mean_value = models.FloatField()
+    sum_value = models.FloatField()
+    
+    class Meta:
+        unique_together = ['region', 'parameter', 'season', 'year']
+    
+    def __str__(self):
+        return f"{self.region.code} - {self.parameter.code} - {self.year} {self.season}: {self.mean_value:.2f}"
+
+class AgroclimateIndex(models.Model):
+    """Per-year agroclimatic indices of a region, refreshed whenever one of their input series is saved"""
+    region = models.ForeignKey(WeatherRegion, on_delete=models.CASCADE)
+    year = models.IntegerField()
+    gdd = models.FloatField(null=True)
+    frost_months = models.PositiveSmallIntegerField(null=True)
+    rain_sun_ratio = models.FloatField(null=True)
+    pet = models.FloatField(null=True)
+    water_balance = models.FloatField(null=True)
+    
+    class Meta:
+        unique_together = ['region', 'year']
+    
+    def __str__(self):
+        return f"{self.region.code} - {self.year}: GDD {self.gdd}"
+
+class StoreGeneration(models.Model):
+    """
+    Single-row token naming the current version of the weather data.
+    
+    Replaced in the same transaction as every write, so every process sees
+    a new token exactly when it sees the new data.
+    """
+    token = models.CharField(max_length=32)
+    
+    def __str__(self):
+        return self.token
+
 class DataSource(models.Model):
     """Model to track data sources and last update times"""
     url = models.URLField()
@@ -52,9 +116,39 @@ class DataSource(models.Model):
     parameter = models.ForeignKey(WeatherParameter, on_delete=models.CASCADE)
     last_updated = models.DateTimeField(null=True, blank=True)
     is_active = models.BooleanField(default=True)
+    # Upstream validators used for conditional fetches
+    etag = models.CharField(max_length=255, blank=True)
+    last_modified = models.CharField(max_length=64, blank=True)
+    content_hash = models.CharField(max_length=64, blank=True)
     
     class Meta:
         unique_together = ['region', 'parameter']
     
     def __str__(self):
-        return f"{self.region.code} - {self.parameter.code} Source"
\ No newline at end of file
+        return f"{self.region.code} - {self.parameter.code} Source"
+
+class ParseJob(models.Model):
+    """Background ingestion run of several region/parameter pairs, executed by one task"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    force = models.BooleanField(default=False)
+    total_pairs = models.PositiveIntegerField(default=0)
+    results = models.JSONField(default=list, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+    
+    @property
+    def completed_pairs(self):
+        return len(self.results)
+    
+    def __str__(self):
+        return f"Parse job {self.id} ({self.status}, {self.completed_pairs}/{self.total_pairs})"
@@ -0,0 +1,115 @@
+import base64
+import binascii
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination with opaque cursors.
+    
+    Pages are selected with a WHERE clause on the last row seen instead of an
+    OFFSET, and there is no COUNT query, so every page costs the same as the
+    first. `ordering` must be unique across rows; all fields descending lets
+    the database walk one composite index backwards.
+    """
+    ordering = ('-year', '-month', '-region_id', '-parameter_id')
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+    invalid_cursor_message = 'Invalid cursor'
+    
+    def get_page_size(self, request):
+        page_size = settings.REST_FRAMEWORK.get('PAGE_SIZE') or 100
+        try:
+            requested = int(request.query_params.get(self.page_size_query_param, page_size))
+        except (TypeError, ValueError):
+            return page_size
+        return max(1, min(requested, self.max_page_size))
+    
+    def _fields(self):
+        return [(field.lstrip('-'), field.startswith('-')) for field in self.ordering]
+    
+    def encode_cursor(self, position, reverse=False):
+        raw = '.'.join(str(value) for value in position) + ('.p' if reverse else '.n')
+        encoded = base64.urlsafe_b64encode(raw.encode('ascii')).decode('ascii').rstrip('=')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+    
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            raw = base64.urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4)).decode('ascii')
+            *position, direction = raw.split('.')
+            if len(position) != len(self.ordering) or direction not in ('n', 'p'):
+                raise ValueError(raw)
+            return [int(value) for value in position], direction == 'p'
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+    
+    def _seek(self, position, reverse):
+        """Rows strictly after position in ordering (before it when reverse)"""
+        condition = Q()
+        equal = Q()
+        for (field, descending), value in zip(self._fields(), position):
+            lookup = 'lt' if descending != reverse else 'gt'
+            condition |= equal & Q(**{f'{field}__{lookup}': value})
+            equal &= Q(**{field: value})
+        return condition
+    
+    def _position(self, row):
+        if isinstance(row, dict):
+            return [row[field] for field, _ in self._fields()]
+        return [getattr(row, field) for field, _ in self._fields()]
+    
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = remove_query_param(request.build_absolute_uri(), 'page')
+        page_size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(request)
+        
+        ordering = self.ordering
+        if reverse:
+            ordering = [field[1:] if field.startswith('-') else f'-{field}' for field in ordering]
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self._seek(position, reverse))
+        
+        rows = list(queryset[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+        
+        self.next_link = self.previous_link = None
+        if rows:
+            has_next = has_more if not reverse else True
+            has_previous = has_more if reverse else position is not None
+            if has_next:
+                self.next_link = self.encode_cursor(self._position(rows[-1]))
+            if has_previous:
+                self.previous_link = self.encode_cursor(self._position(rows[0]), reverse=True)
+        return rows
+    
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.next_link),
+            ('previous', self.previous_link),
+            ('results', data),
+        ]))
+    
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
@@ -1,14 +1,73 @@
+import hashlib
+import io
+import logging
 import requests
 import re
-from datetime import datetime
-from typing import List, Dict, Any
-from .models import WeatherData, WeatherRegion, WeatherParameter, DataSource
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Tuple, Union
+
+import numpy as np
+from django.utils import timezone
+
+from .metrics import ingest_stage
+from .models import WeatherRegion, WeatherParameter, DataSource
+from .sources import STREAM_CHUNK_SIZE, open_source
+from .upsert import upsert_series
+
+logger = logging.getLogger(__name__)
+
+_YEAR_RE = re.compile(r'\d{4}')
+_MISSING_VALUES = frozenset(['---', 'na', 'NA', ''])
+
+SEASONAL_COLUMNS = ('win', 'spr', 'sum', 'aut', 'ann')
+
+
+class MetOfficeTable(NamedTuple):
+    """Array form of a MetOffice data file, NaN where a value is missing"""
+    years: np.ndarray
+    monthly: np.ndarray
+    seasonal: np.ndarray
+
+
+def split_lines(chunks: Iterable[bytes], digest=None) -> Iterator[bytes]:
+    """
+    Split a stream of byte chunks into lines.
+    
+    Every chunk is fed to digest (e.g. hashlib.sha256()) as it passes, so
+    the digest matches the hash of the whole body without holding it.
+    """
+    pending = b''
+    for chunk in chunks:
+        if digest is not None:
+            digest.update(chunk)
+        lines = (pending + chunk).split(b'\n')
+        pending = lines.pop()
+        yield from lines
+    if pending:
+        yield pending
+
+
+def _to_float(token: str) -> float:
+    try:
+        return float(token)
+    except ValueError:
+        return np.nan
+
 
 class MetOfficeParser:
     """Parser for UK MetOffice weather data"""
     
     BASE_URL = "https://www.metoffice.gov.uk/pub/data/weather/uk/climate/datasets"
     
+    _SKIP_PREFIXES = ('#', 'Provisional')
+    
+    VALIDATOR_FIELDS = ('etag', 'last_modified', 'content_hash')
+    
+    # Stored values within this absolute difference of the parsed value are left alone
+    VALUE_TOLERANCE = 0.0
+    
     REGIONS = {
         'UK': 'United Kingdom',
         'England': 'England',
@@ -25,11 +84,28 @@ class MetOfficeParser:
         'Rainfall': {'name': 'Rainfall', 'unit': 'mm'},
     }
     
-    def __init__(self):
+    def __init__(self, source=None):
+        """
+        Args:
+            source: Where to read the dataset tree from. None or an http(s)
+                base URL fetches over HTTP; a directory or zip/tar archive
+                path reads a local mirror with the same layout.
+        """
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
+        self.source = None
+        if isinstance(source, str) and source.startswith(('http://', 'https://')):
+            self.BASE_URL = source.rstrip('/')
+        elif source is not None:
+            self.source = open_source(source) if isinstance(source, (str, Path)) else source
+    
+    def _configure_pool(self, workers: int):
+        """Size the session's connection pool so concurrent fetches reuse connections"""
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
     
     def _parse_csv(self, csv_text):
         """
@@ -114,188 +190,504 @@ class MetOfficeParser:
                 }
             )
     
+    def get_data_path(self, region: str, parameter: str) -> str:
+        """Path of a region/parameter file relative to the dataset root"""
+        return f"{parameter}/date/{region}.txt"
+    
     def get_data_url(self, region: str, parameter: str) -> str:
         """Generate URL for specific region and parameter"""
-        return f"{self.BASE_URL}/{parameter}/date/{region}.txt"
+        if self.source is not None:
+            return self.source.location(self.get_data_path(region, parameter))
+        return f"{self.BASE_URL}/{self.get_data_path(region, parameter)}"
     
     def fetch_data(self, url: str) -> str:
-        """Fetch data from URL"""
+        """Fetch data from URL, or from the local source for a get_data_url() location"""
+        return self.fetch_conditional(url)['content']
+    
+    def stream_data(self, url: str) -> Iterator[Tuple[int, int, float]]:
+        """Stream and parse a file without holding the whole body in memory"""
+        yield from self.iter_data_content(split_lines(self.open_conditional(url)['chunks']))
+    
+    def open_conditional(self, url: str, validators: Dict[str, str] = None) -> Dict[str, Any]:
+        """
+        Start a download, revalidating against previously stored validators.
+        
+        Only the response headers are read; the body is left to the caller.
+        A location of the local source (see get_data_url) is read from the
+        source instead of over HTTP.
+        
+        Args:
+            url (str): File URL
+            validators (dict): Stored 'etag' and 'last_modified' of the last
+                ingested copy, or None to fetch unconditionally
+        
+        Returns:
+            dict: 'chunks', an iterator over the body in STREAM_CHUNK_SIZE
+            pieces (None when the server answered 304 Not Modified), plus
+            the new 'etag' and 'last_modified'
+        """
+        validators = validators or {}
+        path = self.source.relative(url) if self.source is not None else None
+        if path is not None:
+            return self.source.fetch(path, validators)
+        
+        headers = {}
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+        
+        try:
+            response = self.session.get(url, headers=headers, timeout=30, stream=True)
+        except requests.RequestException as e:
+            raise Exception(f"Failed to fetch data from {url}: {str(e)}")
+        if response.status_code == 304:
+            response.close()
+            return {
+                'chunks': None,
+                'etag': response.headers.get('ETag', validators.get('etag', '')),
+                'last_modified': response.headers.get('Last-Modified', validators.get('last_modified', '')),
+            }
         try:
-            response = self.session.get(url, timeout=30)
             response.raise_for_status()
-            return response.text
         except requests.RequestException as e:
+            response.close()
             raise Exception(f"Failed to fetch data from {url}: {str(e)}")
+        
+        return {
+            'chunks': self._response_chunks(response, url),
+            'etag': response.headers.get('ETag', ''),
+            'last_modified': response.headers.get('Last-Modified', ''),
+        }
     
-    def parse_data_content(self, content: str) -> List[Dict[str, Any]]:
-        """Parse the content of weather data file"""
-        print(f"Debug: Starting to parse content. Content length: {len(content)} characters")
-        print("Debug: First 200 chars of content:", content[:200])
+    @staticmethod
+    def _response_chunks(response, url: str) -> Iterator[bytes]:
+        with response:
+            try:
+                yield from response.iter_content(STREAM_CHUNK_SIZE)
+            except requests.RequestException as e:
+                raise Exception(f"Failed to fetch data from {url}: {str(e)}")
+    
+    def fetch_conditional(self, url: str, validators: Dict[str, str] = None) -> Dict[str, Any]:
+        """
+        Fetch a whole file, revalidating against previously stored validators.
         
-        lines = content.strip().split('\n')
-        print(f"Debug: Found {len(lines)} lines in content")
+        Args:
+            url (str): File URL
+            validators (dict): Stored 'etag', 'last_modified' and 'content_hash'
+                of the last ingested copy, or None to fetch unconditionally
         
-        data_lines = []
+        Returns:
+            dict: 'content' (None when the file has not changed since the
+            stored copy), plus the new 'etag', 'last_modified' and 'content_hash'
+        """
+        validators = validators or {}
+        opened = self.open_conditional(url, validators)
+        if opened['chunks'] is None:
+            return {
+                'content': None,
+                'etag': opened['etag'],
+                'last_modified': opened['last_modified'],
+                'content_hash': validators.get('content_hash', ''),
+            }
         
-        # Skip header lines and find data start
+        data = b''.join(opened['chunks'])
+        content_hash = hashlib.sha256(data).hexdigest()
+        return {
+            'content': None if content_hash == validators.get('content_hash') else data.decode('utf-8', 'replace'),
+            'etag': opened['etag'],
+            'last_modified': opened['last_modified'],
+            'content_hash': content_hash,
+        }
+    
+    def iter_data_content(self, lines: Iterable[Union[str, bytes]]) -> Iterator[Tuple[int, int, float]]:
+        """
+        Lazily parse a weather data file line by line.
+        
+        Args:
+            lines: Any iterable of str or bytes lines, e.g. a file object or
+                response.iter_lines()
+        
+        Yields:
+            tuple: (year, month, value) for every non-missing monthly value
+        """
         data_started = False
-        for i, line in enumerate(lines):
+        line_count = 0
+        year_count = 0
+        
+        for line_count, line in enumerate(lines, 1):
+            if isinstance(line, bytes):
+                line = line.decode('utf-8', 'replace')
             line = line.strip()
-            if not line or line.startswith('#') or line.startswith('Provisional'):
-                print(f"Debug: Skipping line {i+1}: {line[:50]}...")
+            if not line or line.startswith(self._SKIP_PREFIXES):
                 continue
             
-            # Look for year pattern (4 digits)
-            if re.match(r'^\d{4}', line):
+            if not data_started:
+                # Header lines precede the first row starting with a 4 digit year
+                if not _YEAR_RE.match(line):
+                    continue
                 data_started = True
-                print(f"Debug: Found data start at line {i+1}: {line[:50]}...")
+                logger.debug("Found data start at line %d: %.50s", line_count, line)
             
-            if data_started:
-                data_lines.append(line)
-        
-        print(f"Debug: Found {len(data_lines)} data lines after filtering")
-        
-        parsed_data = []
-        
-        for line_num, line in enumerate(data_lines, 1):
             parts = line.split()
             if len(parts) < 13:  # Year + 12 months
-                print(f"Debug: Line {line_num} has too few parts: {line}")
+                logger.debug("Line %d has too few parts: %s", line_count, line)
                 continue
             
             try:
                 year = int(parts[0])
-                monthly_values = parts[1:13]  # 12 monthly values
-                print(f"Debug: Processing year {year} with values: {' '.join(monthly_values)}")
-                
-                for month, value_str in enumerate(monthly_values, 1):
-                    # Handle missing values
-                    if value_str in ['---', 'na', 'NA', '']:
-                        print(f"Debug: Skipping missing value for year {year}, month {month}")
-                        continue
-                    
-                    try:
-                        value = float(value_str)
-                        parsed_data.append({
-                            'year': year,
-                            'month': month,
-                            'value': value
-                        })
-                    except ValueError:
-                        continue
-                        
-            except (ValueError, IndexError):
+            except ValueError:
+                continue
+            year_count += 1
+            
+            for month in range(1, 13):
+                value_str = parts[month]
+                if value_str in _MISSING_VALUES:
+                    continue
+                try:
+                    yield year, month, float(value_str)
+                except ValueError:
+                    continue
+        
+        logger.debug("Parsed %d years from %d lines", year_count, line_count)
+    
+    def parse_table(self, content: str) -> MetOfficeTable:
+        """
+        Parse a weather data file into NumPy arrays in one pass.
+        
+        Needs the whole file in memory, so ingestion streams through
+        iter_data_content instead; this serves the benchmarks and callers
+        that already hold the content.
+        
+        Every row starting with a year is split into the year, the 12 monthly
+        columns and the win/spr/sum/aut/ann columns; missing values ('---')
+        become NaN.
+        
+        Returns:
+            MetOfficeTable: years (n,), monthly (n, 12) and seasonal (n, 5)
+        """
+        width = 1 + 12 + len(SEASONAL_COLUMNS)
+        lines = [line for line in map(str.strip, content.splitlines()) if _YEAR_RE.match(line)]
+        
+        if not lines:
+            return MetOfficeTable(
+                np.empty(0, dtype=np.int64),
+                np.empty((0, 12)),
+                np.empty((0, len(SEASONAL_COLUMNS))),
+            )
+        
+        # Fast path: a rectangular, all-numeric table converts in one call
+        try:
+            flat = np.array(' '.join(lines).replace('---', 'nan').split(), dtype=np.float64)
+        except ValueError:
+            flat = np.empty(0)
+        values = flat.reshape(len(lines), width) if flat.size == len(lines) * width else None
+        if values is None or not np.array_equal(values[:, 0], np.floor(values[:, 0])):
+            # Row lengths vary, or columns shifted into the year position
+            values = self._ragged_table_values(lines, width)
+        
+        valid = ~np.isnan(values[:, 0])
+        values = values[valid]
+        return MetOfficeTable(values[:, 0].astype(np.int64), values[:, 1:13], values[:, 13:])
+    
+    @staticmethod
+    def _ragged_table_values(lines: List[str], width: int) -> np.ndarray:
+        """Token-wise conversion for tables with short rows or stray tokens"""
+        rows = []
+        for line in lines:
+            parts = line.split()
+            if len(parts) < 13:  # Year + 12 months
                 continue
+            if len(parts) < width:
+                parts.extend(['nan'] * (width - len(parts)))
+            rows.append(parts[:width])
+        if not rows:
+            return np.empty((0, width))
         
-        return parsed_data
+        tokens = np.array(rows)
+        tokens = np.where(np.isin(tokens, list(_MISSING_VALUES)), 'nan', tokens)
+        try:
+            return tokens.astype(np.float64)
+        except ValueError:
+            return np.vectorize(_to_float, otypes=[np.float64])(tokens)
     
-    def save_weather_data(self, region_code: str, parameter_code: str, parsed_data: List[Dict[str, Any]]) -> int:
-        """Save parsed data to database"""
-        print(f"Debug: Starting to save {len(parsed_data)} records for {region_code} {parameter_code}")
+    @staticmethod
+    def table_to_records(table: MetOfficeTable) -> List[Dict[str, Any]]:
+        """Adapt a MetOfficeTable to the parse_data_content list-of-dicts output"""
+        rows, cols = np.nonzero(~np.isnan(table.monthly))
+        return [
+            {'year': year, 'month': month, 'value': value}
+            for year, month, value in zip(
+                table.years[rows].tolist(), (cols + 1).tolist(), table.monthly[rows, cols].tolist()
+            )
+        ]
+    
+    def parse_data_content(self, content: str) -> List[Dict[str, Any]]:
+        """Parse the content of weather data file"""
+        return [
+            {'year': year, 'month': month, 'value': value}
+            for year, month, value in self.iter_data_content(io.StringIO(content))
+        ]
+    
+    def save_weather_data(self, region_code: str, parameter_code: str, parsed_data: List[Any],
+                          validators: Dict[str, str] = None, tolerance: float = None) -> Dict[str, int]:
+        """
+        Save parsed data to database, writing only new or revised rows.
+        
+        Args:
+            parsed_data (list): {'year', 'month', 'value'} dictionaries or
+                (year, month, value) tuples
+            validators (dict): Upstream 'etag', 'last_modified' and
+                'content_hash' to record on the DataSource
+            tolerance (float): Absolute difference below which a stored value
+                is left untouched, defaults to VALUE_TOLERANCE
+        
+        Returns:
+            dict: Counts keyed by 'inserted', 'revised' and 'untouched'
+        """
+        logger.debug("Starting to save %d records for %s %s", len(parsed_data), region_code, parameter_code)
         
         try:
             region = WeatherRegion.objects.get(code=region_code)
             parameter = WeatherParameter.objects.get(code=parameter_code)
-            print(f"Debug: Found region {region.id} and parameter {parameter.id}")
+            logger.debug("Found region %s and parameter %s", region.id, parameter.id)
         except WeatherRegion.DoesNotExist:
             error_msg = f"Region not found: {region_code}"
-            print(f"Error: {error_msg}")
+            logger.error(error_msg)
             raise Exception(error_msg)
         except WeatherParameter.DoesNotExist:
             error_msg = f"Parameter not found: {parameter_code}"
-            print(f"Error: {error_msg}")
+            logger.error(error_msg)
             raise Exception(error_msg)
         except Exception as e:
             error_msg = f"Unexpected error: {str(e)}"
-            print(f"Error: {error_msg}")
+            logger.error(error_msg)
             raise Exception(error_msg)
         
-        saved_count = 0
-        error_count = 0
-        
-        for i, data_point in enumerate(parsed_data, 1):
-            try:
-                weather_data, created = WeatherData.objects.update_or_create(
-                    region=region,
-                    parameter=parameter,
-                    year=data_point['year'],
-                    month=data_point['month'],
-                    defaults={'value': data_point['value']}
-                )
-                if created:
-                    saved_count += 1
-                if i % 100 == 0 or i == len(parsed_data):
-                    print(f"Debug: Processed {i}/{len(parsed_data)} records, saved {saved_count} new records")
-            except Exception as e:
-                error_count += 1
-                print(f"Error saving record {i}: {str(e)}")
-                print(f"Record data: {data_point}")
-                if error_count >= 5:  # Stop after 5 errors to avoid flooding logs
-                    print("Too many errors, stopping...")
-                    break
+        try:
+            counts = upsert_series(
+                region, parameter, parsed_data,
+                tolerance=self.VALUE_TOLERANCE if tolerance is None else tolerance
+            )
+        except Exception as e:
+            error_msg = f"Failed to save records for {region_code} {parameter_code}: {str(e)}"
+            logger.error(error_msg)
+            raise Exception(error_msg)
         
         # Update data source
         try:
             url = self.get_data_url(region_code, parameter_code)
-            print(f"Debug: Updating data source for {region_code} {parameter_code}")
+            logger.debug("Updating data source for %s %s", region_code, parameter_code)
+            defaults = {
+                'url': url,
+                'last_updated': timezone.now(),
+                'is_active': True
+            }
+            if validators:
+                defaults.update({field: validators[field] for field in self.VALIDATOR_FIELDS})
             DataSource.objects.update_or_create(
                 region=region,
                 parameter=parameter,
-                defaults={
-                    'url': url,
-                    'last_updated': datetime.now(),
-                    'is_active': True
-                }
+                defaults=defaults
             )
-            print("Debug: Data source updated successfully")
+            logger.debug("Data source updated successfully")
         except Exception as e:
-            print(f"Error updating data source: {str(e)}")
+            logger.error("Error updating data source: %s", e)
+        
+        logger.debug(
+            "Saved %s %s: %d inserted, %d revised, %d untouched",
+            region_code, parameter_code, counts['inserted'], counts['revised'], counts['untouched']
+        )
+        return counts
+    
+    def _load_validators(self, **filters) -> Dict[tuple, Dict[str, str]]:
+        """Stored upstream validators keyed by (region code, parameter code)"""
+        return {
+            (source['region__code'], source['parameter__code']): source
+            for source in DataSource.objects.filter(**filters).values(
+                'region__code', 'parameter__code', *self.VALIDATOR_FIELDS
+            )
+        }
+    
+    def _fetch_and_parse(self, region_code: str, parameter_code: str,
+                         validators: Dict[str, str] = None) -> Dict[str, Any]:
+        """
+        Download and parse one region/parameter file as a stream.
+        
+        The body is split into lines and parsed as it arrives, and the
+        content hash is updated chunk by chunk, so only the parsed rows are
+        ever held in memory.
+        
+        Returns:
+            dict: The new 'etag', 'last_modified' and 'content_hash', and
+            'parsed_data' as (year, month, value) tuples, None when the file
+            is unchanged
+        """
+        validators = validators or {}
+        with ingest_stage('fetch', parameter_code):
+            opened = self.open_conditional(self.get_data_url(region_code, parameter_code), validators)
+        fetched = {
+            'etag': opened['etag'],
+            'last_modified': opened['last_modified'],
+            'content_hash': validators.get('content_hash', ''),
+            'parsed_data': None,
+        }
+        if opened['chunks'] is None:
+            return fetched
         
-        print(f"Debug: Successfully saved {saved_count} out of {len(parsed_data)} records for {region_code} {parameter_code}")
-        return saved_count
+        digest = hashlib.sha256()
+        # The body is transferred while it is parsed, so this stage covers both
+        with ingest_stage('parse', parameter_code):
+            rows = list(self.iter_data_content(split_lines(opened['chunks'], digest)))
+        fetched['content_hash'] = digest.hexdigest()
+        if fetched['content_hash'] != validators.get('content_hash'):
+            fetched['parsed_data'] = rows
+        return fetched
     
-    def parse_and_save(self, region_code: str, parameter_code: str) -> Dict[str, Any]:
-        """Complete parsing and saving process"""
+    def _save_parsed(self, region_code: str, parameter_code: str, fetched: Dict[str, Any]) -> Dict[str, Any]:
+        """Save parsed data and build the per-pair result"""
+        validators = {field: fetched[field] for field in self.VALIDATOR_FIELDS}
         url = self.get_data_url(region_code, parameter_code)
         
-        try:
-            # Fetch data
-            content = self.fetch_data(url)
-            
-            # Parse data
-            parsed_data = self.parse_data_content(content)
-            
-            # Save to database
-            saved_count = self.save_weather_data(region_code, parameter_code, parsed_data)
-            
+        if fetched['parsed_data'] is None:
+            # Refresh validators in case the server issued new ones for the same bytes
+            DataSource.objects.filter(
+                region__code=region_code, parameter__code=parameter_code
+            ).update(**validators)
             return {
                 'success': True,
+                'unchanged': True,
                 'region': region_code,
                 'parameter': parameter_code,
                 'url': url,
-                'total_records': len(parsed_data),
-                'saved_records': saved_count,
-                'message': f'Successfully parsed and saved {saved_count} records for {region_code} {parameter_code}'
+                'total_records': 0,
+                'saved_records': 0,
+                'inserted_records': 0,
+                'revised_records': 0,
+                'untouched_records': 0,
+                'message': f'No changes upstream for {region_code} {parameter_code}, skipped'
             }
-            
+        
+        parsed_data = fetched['parsed_data']
+        with ingest_stage('save', parameter_code):
+            counts = self.save_weather_data(region_code, parameter_code, parsed_data, validators=validators)
+        saved_count = counts['inserted']
+        
+        return {
+            'success': True,
+            'unchanged': False,
+            'region': region_code,
+            'parameter': parameter_code,
+            'url': url,
+            'total_records': len(parsed_data),
+            'saved_records': saved_count,
+            'inserted_records': counts['inserted'],
+            'revised_records': counts['revised'],
+            'untouched_records': counts['untouched'],
+            'message': f'Successfully parsed and saved {saved_count} records for {region_code} {parameter_code}'
+        }
+    
+    def failure_result(self, region_code: str, parameter_code: str, error: Exception) -> Dict[str, Any]:
+        """Per-pair result of a pair that could not be ingested"""
+        return {
+            'success': False,
+            'region': region_code,
+            'parameter': parameter_code,
+            'url': self.get_data_url(region_code, parameter_code),
+            'error': str(error),
+            'message': f'Failed to parse data for {region_code} {parameter_code}: {str(error)}'
+        }
+    
+    def _ingest(self, region_code: str, parameter_code: str, validators: Dict[str, str] = None) -> Dict[str, Any]:
+        try:
+            fetched = self._fetch_and_parse(region_code, parameter_code, validators)
+            return self._save_parsed(region_code, parameter_code, fetched)
         except Exception as e:
-            return {
-                'success': False,
-                'region': region_code,
-                'parameter': parameter_code,
-                'url': url,
-                'error': str(e),
-                'message': f'Failed to parse data for {region_code} {parameter_code}: {str(e)}'
-            }
+            return self.failure_result(region_code, parameter_code, e)
     
-    def parse_all_data(self) -> List[Dict[str, Any]]:
-        """Parse data for all regions and parameters"""
+    def parse_and_save(self, region_code: str, parameter_code: str, force: bool = False) -> Dict[str, Any]:
+        """
+        Complete parsing and saving process.
+        
+        Unless force is set, the file is only parsed and saved when it has
+        changed since the last successful ingest.
+        """
+        validators = None
+        if not force:
+            validators = self._load_validators(
+                region__code=region_code, parameter__code=parameter_code
+            ).get((region_code, parameter_code))
+        return self._ingest(region_code, parameter_code, validators)
+    
+    def parse_all_data(self, workers: int = 1, force: bool = False) -> List[Dict[str, Any]]:
+        """
+        Parse data for all regions and parameters.
+        
+        Args:
+            workers (int): Number of concurrent downloads, see parse_pairs
+            force (bool): Re-download and re-save files even when the stored
+                ETag/Last-Modified or content hash says they are unchanged
+        
+        Returns:
+            list: Per-pair results in REGIONS x PARAMETERS order
+        """
         self.initialize_regions_and_parameters()
-        results = []
+        pairs = [
+            (region_code, parameter_code)
+            for region_code in self.REGIONS.keys()
+            for parameter_code in self.PARAMETERS.keys()
+        ]
+        return self.parse_pairs(pairs, workers=workers, force=force)
+    
+    def parse_pairs(self, pairs: List[Tuple[str, str]], workers: int = 1, force: bool = False,
+                    on_result: Callable[[Dict[str, Any]], None] = None) -> List[Dict[str, Any]]:
+        """
+        Parse and save the given region/parameter pairs.
+        
+        Args:
+            pairs (list): (region code, parameter code) tuples
+            workers (int): Number of concurrent downloads. With more than one
+                worker, files are fetched and parsed on a thread pool while
+                this thread saves each finished series, so database writes
+                stay on a single connection.
+            force (bool): Ignore the stored validators, see parse_and_save
+            on_result (callable): Called on this thread with every pair's
+                result as soon as it is saved, e.g. to record progress
         
-        for region_code in self.REGIONS.keys():
-            for parameter_code in self.PARAMETERS.keys():
-                result = self.parse_and_save(region_code, parameter_code)
-                results.append(result)
+        Returns:
+            list: Per-pair results in the order of pairs; a pair that fails
+            gets a failure result instead of raising
+        """
+        # Validators are read up front so worker threads never touch the database
+        stored_validators = {} if force else self._load_validators()
+        on_result = on_result or (lambda result: None)
+        results = {}
+        
+        if workers <= 1:
+            for region_code, parameter_code in pairs:
+                result = self._ingest(region_code, parameter_code, stored_validators.get((region_code, parameter_code)))
+                results[(region_code, parameter_code)] = result
+                on_result(result)
+            return [results[pair] for pair in pairs]
+        
+        workers = min(workers, len(pairs))
+        self._configure_pool(workers)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(
+                    self._fetch_and_parse, region_code, parameter_code,
+                    stored_validators.get((region_code, parameter_code))
+                ): (region_code, parameter_code)
+                for region_code, parameter_code in pairs
+            }
+            for future in as_completed(futures):
+                region_code, parameter_code = futures[future]
+                try:
+                    fetched = future.result()
+                    result = self._save_parsed(region_code, parameter_code, fetched)
+                except Exception as e:
+                    result = self.failure_result(region_code, parameter_code, e)
+                results[(region_code, parameter_code)] = result
+                on_result(result)
         
-        return results
\ No newline at end of file
+        return [results[pair] for pair in pairs]
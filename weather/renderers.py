@@ -0,0 +1,166 @@
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pyarrow
+import pyarrow.ipc
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.settings import api_settings
+
+from .downsample import DOWNSAMPLERS
+
+# Formats served by chart_data as a dense series instead of labelled arrays
+COLUMNAR_FORMATS = ('columnar', 'f32', 'arrow')
+
+
+def columnar_series(region: str, parameter: str, rows: Iterable[Tuple[int, int, float]],
+                    max_points: Optional[int] = None, downsample: str = 'lttb') -> Dict[str, Any]:
+    """
+    Pack monthly rows into a dense series starting at the first month.
+
+    Args:
+        region: Region code the rows belong to
+        parameter: Parameter code the rows belong to
+        rows: Iterable of (year, month, value) tuples, in any order
+        max_points: Downsample to at most this many points when the series is longer
+        downsample: Downsampling method, a key of DOWNSAMPLERS
+
+    Returns:
+        dict: region, parameter, start_year, start_month and values, with
+        values one float per month and None for missing months. A
+        downsampled series also has offsets, the month offset from the
+        start of each kept value, and values holds only the kept points.
+    """
+    table = np.array(list(rows), dtype=np.float64).reshape(-1, 3)
+    if not len(table):
+        return dense_series(region, parameter, None, None, np.empty(0))
+
+    offsets = (table[:, 0] * 12 + table[:, 1] - 1).astype(np.int64)
+    first = int(offsets.min())
+    values = np.full(int(offsets.max()) - first + 1, np.nan)
+    values[offsets - first] = table[:, 2]
+    start_year, start_month = divmod(first, 12)
+    return dense_series(region, parameter, start_year, start_month + 1, values, max_points, downsample)
+
+
+def dense_series(region: str, parameter: str, start_year: Optional[int], start_month: Optional[int],
+                 values: np.ndarray, max_points: Optional[int] = None, downsample: str = 'lttb') -> Dict[str, Any]:
+    """
+    The columnar_series dictionary for an already dense array.
+
+    Args:
+        start_year: Year of values[0], None for an empty series
+        start_month: Month of values[0], None for an empty series
+        values: One value per month, NaN for gaps
+
+    Returns:
+        dict: As columnar_series
+    """
+    series = {'region': region, 'parameter': parameter, 'start_year': start_year, 'start_month': start_month}
+    present = np.flatnonzero(~np.isnan(values))
+    if max_points and len(present) > max_points:
+        keep = present[DOWNSAMPLERS[downsample](present.astype(np.float64), values[present], max_points)]
+        series['offsets'] = keep.tolist()
+        series['values'] = values[keep].tolist()
+    else:
+        series['values'] = np.where(np.isnan(values), None, values).tolist()
+    return series
+
+
+def _float32(values) -> np.ndarray:
+    return np.asarray(values, dtype='<f4')
+
+
+def _render_json(data, renderer_context) -> bytes:
+    """Render a payload that is not the renderer's own (e.g. an error) as JSON, relabelling the response"""
+    response = (renderer_context or {}).get('response')
+    if response is not None:
+        response['Content-Type'] = 'application/json'
+    return JSONRenderer().render(data, 'application/json', renderer_context)
+
+
+class ColumnarJSONRenderer(JSONRenderer):
+    """JSON for the dense series; gaps are null"""
+    format = 'columnar'
+
+
+class Float32Renderer(BaseRenderer):
+    """
+    Raw little-endian float32 values, NaN for gaps.
+
+    The series metadata travels in X-Series-* response headers, with
+    X-Series-Points always giving the number of values, so an empty series
+    (an empty body) reads as 0 points. A downsampled series is followed by
+    its month offsets as little-endian int32. Errors are rendered as JSON.
+    """
+    media_type = 'application/octet-stream'
+    format = 'f32'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if not isinstance(data, dict) or 'values' not in data:
+            return _render_json(data, renderer_context)
+        response = (renderer_context or {}).get('response')
+        if response is not None:
+            response['X-Series-Region'] = data['region']
+            response['X-Series-Parameter'] = data['parameter']
+            if data['start_year'] is not None:
+                response['X-Series-Start'] = f"{data['start_year']}-{data['start_month']:02d}"
+            response['X-Series-Points'] = str(len(data['values']))
+        content = _float32(data['values']).tobytes()
+        if 'offsets' in data:
+            content += np.asarray(data['offsets'], dtype='<i4').tobytes()
+        return content
+
+
+class ArrowStreamRenderer(BaseRenderer):
+    """
+    Arrow IPC stream with a float32 'value' column and the series metadata on the schema.
+
+    A downsampled series adds an int32 'offset' column with the month
+    offsets. Errors are rendered as JSON.
+    """
+    media_type = 'application/vnd.apache.arrow.stream'
+    format = 'arrow'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if not isinstance(data, dict) or 'values' not in data:
+            return _render_json(data, renderer_context)
+        metadata = {key: str(data[key]) for key in ('region', 'parameter', 'start_year', 'start_month')}
+        columns = [pyarrow.array(_float32(data['values']), type=pyarrow.float32())]
+        names = ['value']
+        if 'offsets' in data:
+            columns.append(pyarrow.array(data['offsets'], type=pyarrow.int32()))
+            names.append('offset')
+        batch = pyarrow.record_batch(columns, names=names).replace_schema_metadata(metadata)
+        sink = pyarrow.BufferOutputStream()
+        with pyarrow.ipc.new_stream(sink, batch.schema) as writer:
+            writer.write_batch(batch)
+        return sink.getvalue().to_pybytes()
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    text/csv for the streaming export.
+
+    Export rows are streamed by the view; this renders the small non-streamed
+    responses (errors) as JSON.
+    """
+    media_type = 'text/csv'
+    format = 'csv'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return _render_json(data, renderer_context)
+
+
+class NDJSONRenderer(CSVRenderer):
+    """application/x-ndjson for the streaming export"""
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+
+def series_renderers():
+    """Renderer classes for endpoints that can emit a dense series"""
+    return list(api_settings.DEFAULT_RENDERER_CLASSES) + [ColumnarJSONRenderer, Float32Renderer, ArrowStreamRenderer]
@@ -0,0 +1,122 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+from .models import WeatherData, WeatherRollup
+
+# Months per season as (year offset, month). Winter is labelled with the
+# year of its January and includes the previous December, as in the
+# MetOffice win column.
+SEASON_MONTHS = {
+    'win': ((-1, 12), (0, 1), (0, 2)),
+    'spr': ((0, 3), (0, 4), (0, 5)),
+    'sum': ((0, 6), (0, 7), (0, 8)),
+    'aut': ((0, 9), (0, 10), (0, 11)),
+    'ann': tuple((0, month) for month in range(1, 13)),
+}
+
+
+def affected_years(changed: Iterable[Tuple[int, int]]) -> set:
+    """Rollup years touched by changes to the given (year, month) cells"""
+    years = set()
+    for year, month in changed:
+        years.add(year)
+        if month == 12:
+            years.add(year + 1)
+    return years
+
+
+def compute_rollups(values: Dict[Tuple[int, int], float], years: Iterable[int]) -> List[dict]:
+    """Season statistics for the given years from a (year, month) -> value map"""
+    rollups = []
+    for year in sorted(years):
+        for season, months in SEASON_MONTHS.items():
+            season_values = [
+                values[(year + offset, month)]
+                for offset, month in months
+                if (year + offset, month) in values
+            ]
+            if not season_values:
+                continue
+            total = sum(season_values)
+            rollups.append({
+                'year': year,
+                'season': season,
+                'count': len(season_values),
+                'min_value': min(season_values),
+                'max_value': max(season_values),
+                'mean_value': total / len(season_values),
+                'sum_value': total,
+            })
+    return rollups
+
+
+def refresh_rollups(region, parameter, years: Iterable[int]) -> int:
+    """
+    Recompute the rollups of one series for the given years only.
+    
+    region and parameter may be model instances or primary keys.
+    
+    Reads the base rows of those years (plus the preceding Decembers for
+    winter) in one query and replaces the matching WeatherRollup rows.
+    
+    Returns:
+        int: Number of rollup rows written
+    """
+    years = set(years)
+    if not years:
+        return 0
+    region_id = getattr(region, 'pk', region)
+    parameter_id = getattr(parameter, 'pk', parameter)
+    
+    values = {
+        (year, month): value
+        for year, month, value in WeatherData.objects.filter(
+            region_id=region_id, parameter_id=parameter_id,
+            year__in=years | {year - 1 for year in years}
+        ).order_by().values_list('year', 'month', 'value')
+    }
+    
+    WeatherRollup.objects.filter(region_id=region_id, parameter_id=parameter_id, year__in=years).delete()
+    rollups = WeatherRollup.objects.bulk_create([
+        WeatherRollup(region_id=region_id, parameter_id=parameter_id, **rollup)
+        for rollup in compute_rollups(values, years)
+    ])
+    return len(rollups)
+
+
+def yearly_summary(rows: Iterable[Tuple[int, int, float, float, float]]) -> Dict[str, object]:
+    """
+    Combine annual rollup rows into the WeatherSummaryView statistics.
+    
+    Args:
+        rows: (year, count, min_value, max_value, sum_value) for season 'ann',
+            possibly spanning several series
+    
+    Returns:
+        dict: 'total_records', 'data_range' and per-year 'yearly' averages
+    """
+    by_year = defaultdict(lambda: [0, 0.0])
+    total_records = 0
+    min_value = max_value = None
+    for year, count, row_min, row_max, row_sum in rows:
+        by_year[year][0] += count
+        by_year[year][1] += row_sum
+        total_records += count
+        min_value = row_min if min_value is None else min(min_value, row_min)
+        max_value = row_max if max_value is None else max(max_value, row_max)
+    
+    total_sum = sum(year_sum for _, year_sum in by_year.values())
+    return {
+        'total_records': total_records,
+        'data_range': {
+            'min_year': min(by_year) if by_year else None,
+            'max_year': max(by_year) if by_year else None,
+            'min_value': min_value,
+            'max_value': max_value,
+            'avg_value': total_sum / total_records if total_records else None,
+        },
+        'yearly': [
+            (year, by_year[year][1] / by_year[year][0])
+            for year in sorted(by_year)
+        ],
+    }
@@ -1,5 +1,9 @@
 from rest_framework import serializers
-from .models import WeatherData, WeatherRegion, WeatherParameter, DataSource
+from .models import WeatherData, WeatherRegion, WeatherParameter, DataSource, ParseJob
+from .analytics import DEFAULT_BASELINE, DEFAULT_WINDOWS
+from .batch import MAX_BATCH_SERIES, SERIES_AGGREGATIONS
+from .downsample import DOWNSAMPLERS
+from .fastpath import metadata
 
 class WeatherRegionSerializer(serializers.ModelSerializer):
     class Meta:
@@ -41,4 +45,118 @@ class DataSourceSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = DataSource
-        fields = '__all__'
\ No newline at end of file
+        fields = '__all__'
+
+class ParseJobSerializer(serializers.ModelSerializer):
+    completed_pairs = serializers.IntegerField(read_only=True)
+    failed_pairs = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = ParseJob
+        fields = [
+            'id', 'status', 'force', 'total_pairs', 'completed_pairs', 'failed_pairs',
+            'results', 'created_at', 'finished_at'
+        ]
+    
+    def get_failed_pairs(self, obj):
+        return sum(1 for result in obj.results if not result.get('success'))
+
+class SeriesSpecSerializer(serializers.Serializer):
+    region = serializers.CharField()
+    parameter = serializers.CharField()
+    year_from = serializers.IntegerField(required=False, allow_null=True)
+    year_to = serializers.IntegerField(required=False, allow_null=True)
+    aggregation = serializers.ChoiceField(choices=SERIES_AGGREGATIONS, default='monthly')
+    max_points = serializers.IntegerField(required=False, allow_null=True, min_value=3)
+    downsample = serializers.ChoiceField(choices=list(DOWNSAMPLERS), default='lttb')
+    
+    def validate(self, attrs):
+        if (attrs.get('year_from') is not None and attrs.get('year_to') is not None
+                and attrs['year_from'] > attrs['year_to']):
+            raise serializers.ValidationError('year_from must not be after year_to')
+        
+        region_id, parameter_id = metadata.ids(attrs['region'], attrs['parameter'])
+        if region_id is None:
+            raise serializers.ValidationError({'region': f"Unknown region {attrs['region']}"})
+        if parameter_id is None:
+            raise serializers.ValidationError({'parameter': f"Unknown parameter {attrs['parameter']}"})
+        attrs['region_id'], attrs['parameter_id'] = region_id, parameter_id
+        return attrs
+
+class SeriesBatchSerializer(serializers.Serializer):
+    series = SeriesSpecSerializer(many=True, allow_empty=False, max_length=MAX_BATCH_SERIES)
+
+class SeriesQuerySerializer(serializers.Serializer):
+    """Query parameters selecting one series and an optional year range"""
+    region = serializers.CharField(default='UK')
+    parameter = serializers.CharField(default='Tmean')
+    year_from = serializers.IntegerField(required=False, allow_null=True)
+    year_to = serializers.IntegerField(required=False, allow_null=True)
+    
+    def validate(self, attrs):
+        if (attrs.get('year_from') is not None and attrs.get('year_to') is not None
+                and attrs['year_from'] > attrs['year_to']):
+            raise serializers.ValidationError('year_from must not be after year_to')
+        return attrs
+
+class AnomalyQuerySerializer(SeriesQuerySerializer):
+    baseline_from = serializers.IntegerField(default=DEFAULT_BASELINE[0])
+    baseline_to = serializers.IntegerField(default=DEFAULT_BASELINE[1])
+    windows = serializers.ListField(
+        child=serializers.IntegerField(min_value=2, max_value=600),
+        default=list(DEFAULT_WINDOWS), max_length=6
+    )
+    
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        if attrs['baseline_from'] > attrs['baseline_to']:
+            raise serializers.ValidationError('baseline_from must not be after baseline_to')
+        return attrs
+
+class TrendQuerySerializer(SeriesQuerySerializer):
+    rolling_window = serializers.IntegerField(required=False, allow_null=True, min_value=5, max_value=200)
+    change_points = serializers.BooleanField(default=False)
+
+class RankQuerySerializer(SeriesQuerySerializer):
+    year_from = None
+    year_to = None
+    month = serializers.IntegerField(required=False, allow_null=True, min_value=1, max_value=12)
+    year = serializers.IntegerField(required=False, allow_null=True)
+    value = serializers.FloatField(required=False, allow_null=True)
+    top = serializers.IntegerField(default=3, min_value=0, max_value=50)
+    
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        if attrs.get('year') is not None and attrs.get('value') is not None:
+            raise serializers.ValidationError('Give either year or value, not both')
+        if (attrs.get('year') is not None or attrs.get('value') is not None) and attrs.get('month') is None:
+            raise serializers.ValidationError({'month': 'month is required with year or value'})
+        return attrs
+
+class AgroclimateQuerySerializer(SeriesQuerySerializer):
+    region = serializers.CharField(required=False, allow_null=True, default=None)
+    parameter = None
+    
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        if attrs['region'] and metadata.ids(attrs['region'], None)[0] is None:
+            raise serializers.ValidationError({'region': f"Unknown region {attrs['region']}"})
+        return attrs
+
+class CompareQuerySerializer(SeriesQuerySerializer):
+    region = None
+    regions = serializers.ListField(child=serializers.CharField(), required=False, max_length=32)
+    lag = serializers.IntegerField(default=0, min_value=-120, max_value=120)
+    anomalies = serializers.BooleanField(default=False)
+    include_series = serializers.BooleanField(default=True)
+    
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        if metadata.ids(None, attrs['parameter'])[1] is None:
+            raise serializers.ValidationError({'parameter': f"Unknown parameter {attrs['parameter']}"})
+        regions = list(dict.fromkeys(attrs.get('regions') or []))
+        unknown = [code for code in regions if metadata.ids(code, attrs['parameter'])[0] is None]
+        if unknown:
+            raise serializers.ValidationError({'regions': f"Unknown region(s): {', '.join(unknown)}"})
+        attrs['regions'] = regions
+        return attrs
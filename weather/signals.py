@@ -0,0 +1,87 @@
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, Tuple
+
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .agroclimate import AGROCLIMATE_INPUTS, refresh_agroclimate
+from .fastpath import metadata
+from .models import DataSource, WeatherData
+from .rollups import affected_years, refresh_rollups
+from .store import bump_generation
+
+# Deletions in progress on this thread: id(origin) -> [origin, rows still
+# to be deleted, changed cells per series]. Holding the origin keeps its id
+# from being reused while the entry exists.
+_deleting = threading.local()
+
+
+def refresh_derived(changes: Dict[Tuple[int, int], Iterable[Tuple[int, int]]]) -> None:
+    """
+    Bring derived data and cached responses in step with changed rows.
+
+    Args:
+        changes: (year, month) cells that were saved or deleted, keyed by
+            (region_id, parameter_id)
+
+    Refreshes the rollups and agroclimate indices of the affected years
+    only, touches each series' DataSource.last_updated (which moves the
+    ETag, Last-Modified and cache key of every response built from it) and
+    bumps the store generation once.
+    """
+    if not changes:
+        return
+    _, parameters = metadata.tables(
+        [{'region_id': region_id, 'parameter_id': parameter_id} for region_id, parameter_id in changes]
+    )
+    agroclimate_years = defaultdict(set)
+    now = timezone.now()
+    for (region_id, parameter_id), cells in changes.items():
+        cells = list(cells)
+        refresh_rollups(region_id, parameter_id, affected_years(cells))
+        # A cascade delete of the parameter itself leaves no code to check
+        parameter = parameters.get(parameter_id)
+        if parameter is not None and parameter[1] in AGROCLIMATE_INPUTS:
+            agroclimate_years[region_id].update(year for year, _ in cells)
+        DataSource.objects.filter(region_id=region_id, parameter_id=parameter_id).update(last_updated=now)
+    for region_id, years in agroclimate_years.items():
+        refresh_agroclimate([region_id], years)
+    bump_generation()
+
+
+@receiver(post_save, sender=WeatherData)
+def refresh_for_saved_row(sender, instance, **kwargs):
+    """Keep derived data and cached responses in step with single-row saves, e.g. from the admin"""
+    refresh_derived({(instance.region_id, instance.parameter_id): [(instance.year, instance.month)]})
+
+
+@receiver(pre_delete, sender=WeatherData)
+def count_deleted_row(sender, instance, origin=None, **kwargs):
+    batches = _deleting.__dict__.setdefault('batches', {})
+    batch = batches.setdefault(id(origin), [origin, 0, defaultdict(set)])
+    batch[1] += 1
+
+
+@receiver(post_delete, sender=WeatherData)
+def refresh_for_deleted_rows(sender, instance, origin=None, **kwargs):
+    """
+    Refresh derived data once per delete() call, not once per row.
+
+    Django sends pre_delete for every collected row before it sends any
+    post_delete, so the rows are counted on the way in and the changes are
+    applied, inside the delete's transaction, when the last one is gone.
+    This covers instance.delete(), queryset.delete() (the admin's bulk
+    action included) and cascades from regions and parameters.
+    """
+    batches = _deleting.__dict__.setdefault('batches', {})
+    batch = batches.get(id(origin))
+    if batch is None:
+        refresh_derived({(instance.region_id, instance.parameter_id): [(instance.year, instance.month)]})
+        return
+    batch[1] -= 1
+    batch[2][(instance.region_id, instance.parameter_id)].add((instance.year, instance.month))
+    if batch[1] <= 0:
+        del batches[id(origin)]
+        refresh_derived(batch[2])
@@ -0,0 +1,145 @@
+import calendar
+import mmap
+import os
+import tarfile
+import threading
+import zipfile
+from email.utils import formatdate
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Union
+from urllib.parse import unquote
+
+# Bytes read per chunk when streaming a data file
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def _unchanged(etag: str, last_modified: str) -> Dict[str, Any]:
+    return {'chunks': None, 'etag': etag, 'last_modified': last_modified}
+
+
+def _opened(chunks, etag: str, last_modified: str) -> Dict[str, Any]:
+    return {'chunks': chunks, 'etag': etag, 'last_modified': last_modified}
+
+
+def _relative(location: str, prefix: str) -> Optional[str]:
+    return unquote(location[len(prefix):]) if location.startswith(prefix) else None
+
+
+def _file_chunks(path: Path) -> Iterator[bytes]:
+    """STREAM_CHUNK_SIZE slices of a memory-mapped file"""
+    with open(path, 'rb') as f:
+        # Empty files cannot be mapped
+        if not os.fstat(f.fileno()).st_size:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for start in range(0, len(mapped), STREAM_CHUNK_SIZE):
+                yield mapped[start:start + STREAM_CHUNK_SIZE]
+
+
+class DirectorySource:
+    """
+    Local mirror of the MetOffice dataset tree.
+
+    Files are memory-mapped and handed out in STREAM_CHUNK_SIZE slices, so
+    they are parsed without being read into memory whole. The ETag is derived from size and mtime, so an
+    untouched file is reported unchanged without being read at all.
+    """
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+        if not self.root.is_dir():
+            raise ValueError(f"Mirror directory not found: {root}")
+
+    def location(self, path: str) -> str:
+        return self.root.resolve().joinpath(path).as_uri()
+
+    def relative(self, location: str) -> Optional[str]:
+        """Path of a location() URI relative to the root, None for other URIs"""
+        return _relative(location, self.root.resolve().as_uri() + '/')
+
+    def fetch(self, path: str, validators: Dict[str, str] = None) -> Dict[str, Any]:
+        validators = validators or {}
+        file_path = self.root / path
+        try:
+            stat = file_path.stat()
+        except OSError as e:
+            raise Exception(f"Failed to read data from {file_path}: {str(e)}")
+
+        etag = f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+        last_modified = formatdate(stat.st_mtime, usegmt=True)
+        if validators.get('etag') == etag:
+            return _unchanged(etag, last_modified)
+        return _opened(_file_chunks(file_path), etag, last_modified)
+
+
+class ArchiveSource:
+    """
+    MetOffice dataset tree packed in a zip or tar archive.
+
+    Members are matched on their path suffix, so archives with a leading
+    directory (e.g. datasets/Tmean/date/UK.txt) work as well.
+    """
+
+    def __init__(self, archive: Union[str, Path]):
+        self.archive = Path(archive)
+        self._lock = threading.Lock()
+        if zipfile.is_zipfile(self.archive):
+            self._zip = zipfile.ZipFile(self.archive)
+            self._tar = None
+            members = {info.filename: info for info in self._zip.infolist() if not info.is_dir()}
+        elif tarfile.is_tarfile(self.archive):
+            self._zip = None
+            self._tar = tarfile.open(self.archive)
+            members = {info.name: info for info in self._tar.getmembers() if info.isfile()}
+        else:
+            raise ValueError(f"Not a zip or tar archive: {archive}")
+        self._members = members
+
+    def _member(self, path: str):
+        member = self._members.get(path)
+        if member is None:
+            for name, info in self._members.items():
+                if name.endswith('/' + path):
+                    member = info
+                    break
+        if member is None:
+            raise Exception(f"Failed to read data from {self.archive}: no member {path}")
+        return member
+
+    def location(self, path: str) -> str:
+        return f"{self.archive.resolve().as_uri()}!/{path}"
+
+    def relative(self, location: str) -> Optional[str]:
+        """Member path of a location() URI, None for other URIs"""
+        return _relative(location, f"{self.archive.resolve().as_uri()}!/")
+
+    def fetch(self, path: str, validators: Dict[str, str] = None) -> Dict[str, Any]:
+        validators = validators or {}
+        member = self._member(path)
+        if self._zip is not None:
+            etag = f'"{member.CRC:08x}-{member.file_size:x}"'
+            last_modified = formatdate(calendar.timegm(member.date_time + (0, 0, -1)), usegmt=True)
+        else:
+            etag = f'"{member.size:x}-{int(member.mtime):x}"'
+            last_modified = formatdate(member.mtime, usegmt=True)
+        if validators.get('etag') == etag:
+            return _unchanged(etag, last_modified)
+
+        # Members are read whole: tar members share the archive's file
+        # object, and data files are small next to the archive itself
+        with self._lock:
+            if self._zip is not None:
+                data = self._zip.read(member)
+            else:
+                data = self._tar.extractfile(member).read()
+        return _opened([data], etag, last_modified)
+
+
+def open_source(spec: Union[str, Path]):
+    """Build a local source for a mirror directory or a zip/tar archive path"""
+    path = Path(spec)
+    if path.is_dir():
+        return DirectorySource(path)
+    if path.is_file():
+        return ArchiveSource(path)
+    raise ValueError(f"Source not found: {spec}")
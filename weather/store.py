@@ -0,0 +1,206 @@
+import threading
+import uuid
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .fastpath import metadata
+from .models import StoreGeneration, WeatherData
+
+# Primary key of the StoreGeneration row
+GENERATION_ID = 1
+
+
+def current_generation() -> str:
+    """The current store generation token, created on first use"""
+    token = StoreGeneration.objects.filter(pk=GENERATION_ID).values_list('token', flat=True).first()
+    if token is None:
+        token = StoreGeneration.objects.get_or_create(pk=GENERATION_ID, defaults={'token': uuid.uuid4().hex})[0].token
+    return token
+
+
+def bump_generation() -> None:
+    """
+    Invalidate every process's store after weather data was written.
+
+    Call it inside the writing transaction: the token lives in the database,
+    so other processes (web workers, Celery, management commands) see the
+    new token exactly when they see the new data, and a rolled back write
+    keeps the old one.
+    """
+    token = uuid.uuid4().hex
+    if not StoreGeneration.objects.filter(pk=GENERATION_ID).update(token=token):
+        StoreGeneration.objects.create(pk=GENERATION_ID, token=token)
+
+
+class SeriesArrays:
+    """
+    One region/parameter series as a dense monthly array.
+
+    values[i] is the value of month i counted from January of start_year,
+    NaN where there is no data; the array always covers whole years.
+    """
+    __slots__ = ('start_year', 'values', '_labels', '_month_index')
+
+    def __init__(self, start_year: int, values: np.ndarray):
+        self.start_year = start_year
+        self.values = values
+        self._labels = None
+        self._month_index = None
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[int, int, float]]) -> Optional['SeriesArrays']:
+        table = np.array(list(rows), dtype=np.float64).reshape(-1, 3)
+        if not len(table):
+            return None
+        years = table[:, 0].astype(np.int64)
+        start_year = int(years.min())
+        values = np.full((int(years.max()) - start_year + 1) * 12, np.nan)
+        values[(years - start_year) * 12 + table[:, 1].astype(np.int64) - 1] = table[:, 2]
+        values.flags.writeable = False
+        return cls(start_year, values)
+
+    @property
+    def labels(self) -> List[str]:
+        """'YYYY-MM' label of every month, built once per load"""
+        if self._labels is None:
+            self._labels = [
+                f'{self.start_year + offset // 12}-{offset % 12 + 1:02d}'
+                for offset in range(len(self.values))
+            ]
+        return self._labels
+
+    @property
+    def month_index(self) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Per calendar month (values, years) sorted by ascending value, built once per load.
+
+        Ties are ordered by year, so searchsorted on the values ranks any
+        value against the record of that month in O(log n).
+        """
+        if self._month_index is None:
+            years = self.start_year + np.arange(len(self.values) // 12)
+            index = []
+            for column in self.values.reshape(-1, 12).T:
+                present = ~np.isnan(column)
+                values, value_years = column[present], years[present]
+                order = np.lexsort((value_years, values))
+                index.append((values[order], value_years[order]))
+            self._month_index = index
+        return self._month_index
+
+    def window(self, year_from: Optional[int] = None, year_to: Optional[int] = None) -> Tuple[int, int]:
+        """[start, end) month offsets of the years within year_from..year_to"""
+        end_year = self.start_year + len(self.values) // 12 - 1
+        first = self.start_year if year_from is None else min(max(year_from, self.start_year), end_year + 1)
+        last = end_year if year_to is None else max(min(year_to, end_year), first - 1)
+        return (first - self.start_year) * 12, (last - self.start_year + 1) * 12
+
+    def present(self, year_from: Optional[int] = None, year_to: Optional[int] = None) -> np.ndarray:
+        """Month offsets holding a value, within the year range"""
+        start, end = self.window(year_from, year_to)
+        return start + np.flatnonzero(~np.isnan(self.values[start:end]))
+
+    def annual_rows(self, year_from: Optional[int] = None,
+                    year_to: Optional[int] = None) -> List[Tuple[int, int, float, float, float]]:
+        """(year, count, min, max, sum) of every year with data, as yearly_summary takes them"""
+        start, end = self.window(year_from, year_to)
+        years = self.values[start:end].reshape(-1, 12)
+        counts = (~np.isnan(years)).sum(axis=1)
+        rows = years[counts > 0]
+        first_year = self.start_year + start // 12
+        return list(zip(
+            (first_year + np.flatnonzero(counts)).tolist(),
+            counts[counts > 0].tolist(),
+            np.nanmin(rows, axis=1).tolist(),
+            np.nanmax(rows, axis=1).tolist(),
+            # Sequential (cumulative) sums add months in order like SQL SUM
+            # does; np.nansum's pairwise order can flip rounded averages
+            np.nancumsum(rows, axis=1)[:, -1].tolist(),
+        ))
+
+
+class SeriesStore:
+    """
+    Process-local cache of every series as SeriesArrays.
+
+    Series load on first use (or all at once through warm(), e.g. from the
+    gunicorn post_fork hook) and are dropped whenever the generation token
+    changes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._generation = None
+        self._series: Dict[Tuple[str, str], Optional[SeriesArrays]] = {}
+        self._complete = False
+
+    def _sync(self) -> None:
+        generation = current_generation()
+        if generation != self._generation:
+            with self._lock:
+                self._series, self._complete, self._generation = {}, False, generation
+
+    def get(self, region: str, parameter: str) -> Optional[SeriesArrays]:
+        """
+        The arrays of one series, None if it has no data.
+
+        Codes are checked against the metadata lookup first, so unknown
+        codes (e.g. from query strings) are neither queried nor held.
+        """
+        region_id, parameter_id = metadata.ids(region, parameter)
+        if region_id is None or parameter_id is None:
+            return None
+        self._sync()
+        key = (region, parameter)
+        series, generation = self._series, self._generation
+        if key not in series:
+            arrays = SeriesArrays.from_rows(WeatherData.objects.filter(
+                region_id=region_id, parameter_id=parameter_id
+            ).order_by().values_list('year', 'month', 'value'))
+            with self._lock:
+                # Only keep arrays loaded under the generation still current
+                if self._generation == generation:
+                    self._series[key] = arrays
+            return arrays
+        return series[key]
+
+    def _all(self) -> Dict[Tuple[str, str], Optional[SeriesArrays]]:
+        self._sync()
+        series, generation = self._series, self._generation
+        if self._complete:
+            return series
+        grouped = {}
+        for region, parameter, year, month, value in WeatherData.objects.order_by().values_list(
+            'region__code', 'parameter__code', 'year', 'month', 'value'
+        ):
+            grouped.setdefault((region, parameter), []).append((year, month, value))
+        series = {key: SeriesArrays.from_rows(rows) for key, rows in grouped.items()}
+        with self._lock:
+            if self._generation == generation:
+                self._series, self._complete = series, True
+        return series
+
+    def warm(self) -> int:
+        """Load every series in one query; returns the number of series held"""
+        return len(self._all())
+
+    def items(self, region: Optional[str] = None,
+              parameter: Optional[str] = None) -> List[Tuple[Tuple[str, str], SeriesArrays]]:
+        """((region, parameter), arrays) of every series with data matching the optional codes"""
+        if region and parameter:
+            arrays = self.get(region, parameter)
+            return [((region, parameter), arrays)] if arrays is not None else []
+        return [
+            (key, arrays) for key, arrays in self._all().items()
+            if arrays is not None
+            and (not region or key[0] == region)
+            and (not parameter or key[1] == parameter)
+        ]
+
+    def select(self, region: Optional[str] = None, parameter: Optional[str] = None) -> List[SeriesArrays]:
+        """Arrays of every series matching the optional region and parameter codes"""
+        return [arrays for _, arrays in self.items(region, parameter)]
+
+
+store = SeriesStore()
@@ -0,0 +1,58 @@
+from celery import shared_task
+from django.db import transaction
+from django.utils import timezone
+
+from .models import ParseJob
+from .parsers import MetOfficeParser
+
+# Concurrent downloads per job; saves stay on the task's own thread
+PARSE_JOB_WORKERS = 4
+
+
+@shared_task
+def run_parse_job(job_id: str, pairs, force: bool = False, workers: int = PARSE_JOB_WORKERS):
+    """
+    Fetch, parse and save every region/parameter pair of a ParseJob.
+    
+    Files download on a thread pool, but the series and the job's progress
+    are all written from this task's thread, so the database only ever
+    sees one writer. Each pair's result is recorded as it is saved; pairs
+    left over when the job itself fails are recorded as failed, so the job
+    always ends completed.
+    """
+    pairs = [tuple(pair) for pair in pairs]
+    job = ParseJob.objects.get(pk=job_id)
+    job.status = 'running'
+    job.save(update_fields=['status'])
+    
+    def record(result):
+        job.results.append(result)
+        job.save(update_fields=['results'])
+    
+    parser = MetOfficeParser()
+    try:
+        parser.parse_pairs(pairs, workers=workers, force=force, on_result=record)
+    except Exception as e:
+        done = {(result['region'], result['parameter']) for result in job.results}
+        job.results.extend(
+            parser.failure_result(region_code, parameter_code, e)
+            for region_code, parameter_code in pairs if (region_code, parameter_code) not in done
+        )
+    
+    job.status = 'completed'
+    job.finished_at = timezone.now()
+    job.save(update_fields=['results', 'status', 'finished_at'])
+    return job.results
+
+
+def start_parse_job(pairs, force: bool = False, workers: int = PARSE_JOB_WORKERS) -> ParseJob:
+    """
+    Create a ParseJob and queue one run_parse_job task for all its pairs.
+    
+    The task is queued after the job row commits so the worker never sees
+    a missing job; workers is the task's number of concurrent downloads.
+    """
+    MetOfficeParser().initialize_regions_and_parameters()
+    job = ParseJob.objects.create(force=force, total_pairs=len(pairs))
+    transaction.on_commit(lambda: run_parse_job.delay(str(job.pk), pairs, force, workers))
+    return job
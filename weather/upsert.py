@@ -0,0 +1,151 @@
+from typing import Any, Dict, Iterable, List, Tuple
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .agroclimate import AGROCLIMATE_INPUTS, refresh_agroclimate
+from .models import WeatherData, WeatherRegion, WeatherParameter
+from .rollups import affected_years, refresh_rollups
+from .store import bump_generation
+
+# Rows written per INSERT statement (or per executemany call on SQLite)
+UPSERT_BATCH_SIZE = 500
+
+
+def _chunks(items: List[Any], size: int) -> Iterable[List[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _dedupe(parsed_data: Iterable[Any]) -> Dict[Tuple[int, int], float]:
+    """Collapse parsed rows to one value per (year, month), last one wins"""
+    rows = {}
+    for data_point in parsed_data:
+        if isinstance(data_point, dict):
+            year, month, value = data_point['year'], data_point['month'], data_point['value']
+        else:
+            year, month, value = data_point
+        rows[(int(year), int(month))] = float(value)
+    return rows
+
+
+def _sqlite_upsert(region: WeatherRegion, parameter: WeatherParameter,
+                   rows: List[Tuple[int, int, float]], batch_size: int) -> None:
+    """Chunked executemany with ON CONFLICT for SQLite"""
+    table = connection.ops.quote_name(WeatherData._meta.db_table)
+    sql = (
+        f'INSERT INTO {table} '
+        '(region_id, parameter_id, year, month, value, created_at, updated_at) '
+        'VALUES (%s, %s, %s, %s, %s, %s, %s) '
+        'ON CONFLICT (region_id, parameter_id, year, month) '
+        'DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at'
+    )
+    now = timezone.now()
+    with connection.cursor() as cursor:
+        for chunk in _chunks(rows, batch_size):
+            cursor.executemany(sql, [
+                (region.pk, parameter.pk, year, month, value, now, now)
+                for year, month, value in chunk
+            ])
+
+
+def _bulk_create_upsert(region: WeatherRegion, parameter: WeatherParameter,
+                        rows: List[Tuple[int, int, float]], batch_size: int) -> None:
+    """Chunked INSERT ... ON CONFLICT DO UPDATE through the ORM"""
+    now = timezone.now()
+    objs = [
+        WeatherData(
+            region=region, parameter=parameter, year=year, month=month,
+            value=value, created_at=now, updated_at=now,
+        )
+        for year, month, value in rows
+    ]
+    WeatherData.objects.bulk_create(
+        objs,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=['region', 'parameter', 'year', 'month'],
+        update_fields=['value', 'updated_at'],
+    )
+
+
+def diff_series(existing: Dict[Tuple[int, int], float], incoming: Dict[Tuple[int, int], float],
+                tolerance: float = 0.0) -> Tuple[List[Tuple[int, int, float]], Dict[str, int]]:
+    """
+    Compare parsed values against stored ones.
+
+    Args:
+        existing: Stored (year, month) -> value map
+        incoming: Parsed (year, month) -> value map
+        tolerance: Absolute difference at or below which a value counts as unchanged
+
+    Returns:
+        tuple: Rows that need writing as (year, month, value), and counts
+        keyed by 'inserted', 'revised' and 'untouched'
+    """
+    changed = []
+    counts = {'inserted': 0, 'revised': 0, 'untouched': 0}
+    for (year, month), value in sorted(incoming.items()):
+        stored = existing.get((year, month))
+        if stored is None:
+            counts['inserted'] += 1
+        elif abs(stored - value) > tolerance:
+            counts['revised'] += 1
+        else:
+            counts['untouched'] += 1
+            continue
+        changed.append((year, month, value))
+    return changed, counts
+
+
+def upsert_series(region: WeatherRegion, parameter: WeatherParameter,
+                  parsed_data: Iterable[Any],
+                  batch_size: int = None, tolerance: float = 0.0) -> Dict[str, int]:
+    """
+    Write the rows of one region/parameter series that differ from the database.
+
+    The stored (year, month) -> value map is loaded in one query and diffed
+    against the parsed data; only new and revised rows are upserted, in a
+    single transaction, so untouched rows keep their updated_at. Rollups of
+    the affected years, and the region's agroclimatic indices when the
+    series is one of their inputs, are refreshed in the same transaction
+    and the in-process series stores are invalidated.
+
+    Args:
+        region: WeatherRegion the series belongs to
+        parameter: WeatherParameter the series belongs to
+        parsed_data: Iterable of {'year', 'month', 'value'} dictionaries or
+            (year, month, value) tuples
+        batch_size: Rows per write batch, defaults to UPSERT_BATCH_SIZE
+        tolerance: Absolute difference below which a stored value is kept
+
+    Returns:
+        dict: Counts keyed by 'inserted', 'revised' and 'untouched'
+    """
+    incoming = _dedupe(parsed_data)
+    if not incoming:
+        return {'inserted': 0, 'revised': 0, 'untouched': 0}
+
+    with transaction.atomic():
+        existing = {
+            (year, month): value
+            for year, month, value in WeatherData.objects.filter(
+                region=region, parameter=parameter
+            ).order_by().values_list('year', 'month', 'value')
+        }
+        rows, counts = diff_series(existing, incoming, tolerance)
+        if not rows:
+            return counts
+
+        batch_size = batch_size or UPSERT_BATCH_SIZE
+        if connection.vendor == 'sqlite':
+            _sqlite_upsert(region, parameter, rows, batch_size)
+        else:
+            _bulk_create_upsert(region, parameter, rows, batch_size)
+
+        refresh_rollups(region, parameter, affected_years((year, month) for year, month, _ in rows))
+        if parameter.code in AGROCLIMATE_INPUTS:
+            refresh_agroclimate([region.pk], {year for year, _, _ in rows})
+        bump_generation()
+
+    return counts
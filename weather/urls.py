@@ -29,10 +29,19 @@ urlpatterns = [
         path('regions/', views.WeatherRegionListView.as_view(), name='api-regions'),
         path('parameters/', views.WeatherParameterListView.as_view(), name='api-parameters'),
         path('weather-data/', views.WeatherDataListView.as_view(), name='api-weather-data'),
+        path('weather-data/export/', views.WeatherDataExportView.as_view(), name='api-weather-export'),
         path('weather-data/<int:pk>/', views.WeatherDataDetailView.as_view(), name='api-weather-detail'),
         path('parse-data/', views.ParseDataView.as_view(), name='api-parse-data'),
+        path('parse-jobs/<uuid:pk>/', views.ParseJobDetailView.as_view(), name='api-parse-job'),
         path('summary/', views.WeatherSummaryView.as_view(), name='api-summary'),
         path('data-sources/', views.DataSourceListView.as_view(), name='api-data-sources'),
         path('chart-data/', views.chart_data, name='api-chart-data'),
+        path('series/batch/', views.SeriesBatchView.as_view(), name='api-series-batch'),
+        path('analytics/anomalies/', views.AnomalyView.as_view(), name='api-anomalies'),
+        path('analytics/trends/', views.TrendView.as_view(), name='api-trends'),
+        path('analytics/compare/', views.RegionComparisonView.as_view(), name='api-compare'),
+        path('analytics/rank/', views.RankView.as_view(), name='api-rank'),
+        path('analytics/agroclimate/', views.AgroclimateView.as_view(), name='api-agroclimate'),
+        path('metrics/', views.metrics, name='api-metrics'),
     ])),
 ]
\ No newline at end of file
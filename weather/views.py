@@ -2,10 +2,13 @@ from django.shortcuts import render
 
 # Create your views here.
 from django.shortcuts import render
-from django.http import JsonResponse
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.urls import reverse
 from django.db.models import Avg, Min, Max, Count, Q
 from rest_framework import generics, status
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, renderer_classes
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
@@ -13,14 +16,34 @@ from rest_framework.authentication import SessionAuthentication, BasicAuthentica
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 import json
+from itertools import chain
 
-from .models import WeatherData, WeatherRegion, WeatherParameter, DataSource
+import numpy as np
+
+from .models import (
+    WeatherData, WeatherRegion, WeatherParameter, AgroclimateIndex, DataSource, ParseJob
+)
 from .serializers import (
     WeatherDataSerializer, WeatherRegionSerializer, 
     WeatherParameterSerializer, WeatherDataSummarySerializer,
-    DataSourceSerializer
+    DataSourceSerializer, ParseJobSerializer, SeriesBatchSerializer,
+    AnomalyQuerySerializer, TrendQuerySerializer, CompareQuerySerializer,
+    RankQuerySerializer, AgroclimateQuerySerializer
 )
 from .parsers import MetOfficeParser
+from .agroclimate import GDD_BASE, FROST_RISK_TMIN, INDEX_FIELDS
+from .analytics import anomaly_series, rank_report, region_comparison, trend_report
+from .batch import load_series
+from .cache import cached_response
+from .downsample import DOWNSAMPLERS
+from .export import EXPORT_STREAMS
+from .fastpath import WEATHER_DATA_VALUES, metadata, serialize_weather_rows
+from .metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, metrics_enabled, registry
+from .pagination import KeysetPagination
+from .renderers import COLUMNAR_FORMATS, CSVRenderer, NDJSONRenderer, dense_series, series_renderers
+from .rollups import yearly_summary
+from .store import store
+from .tasks import PARSE_JOB_WORKERS, start_parse_job
 
 # API Views
 class WeatherRegionListView(generics.ListAPIView):
@@ -34,9 +57,25 @@ class WeatherParameterListView(generics.ListAPIView):
     serializer_class = WeatherParameterSerializer
 
 class WeatherDataListView(generics.ListAPIView):
-    """List weather data with filtering"""
+    """
+    List weather data with filtering.
+    
+    Pages with keyset cursors by default; pass `page` or `pagination=offset`
+    for the numbered pages with a total count.
+    """
     serializer_class = WeatherDataSerializer
     
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            request = getattr(self, 'request', None)
+            params = request.query_params if request is not None else {}
+            if 'page' in params or params.get('pagination') == 'offset':
+                self._paginator = PageNumberPagination()
+            else:
+                self._paginator = KeysetPagination()
+        return self._paginator
+    
     def get_queryset(self):
         queryset = WeatherData.objects.select_related('region', 'parameter')
         
@@ -64,11 +103,47 @@ class WeatherDataListView(generics.ListAPIView):
             queryset = queryset.filter(year__lte=year_to)
         
         return queryset.order_by('-year', '-month')
+    
+    def list(self, request, *args, **kwargs):
+        # Rows are built from .values() with metadata from an in-process
+        # lookup; the output matches WeatherDataSerializer field for field
+        queryset = self.get_queryset().select_related(None).values(*WEATHER_DATA_VALUES)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serialize_weather_rows(page))
+        return Response(serialize_weather_rows(queryset))
+
+class WeatherDataExportView(WeatherDataListView):
+    """
+    Stream every weather data row matching the list filters as CSV or NDJSON.
+    
+    ?format=csv (default) or ?format=ndjson; the body is streamed in chunks
+    read through a server-side cursor, so there is no pagination and no
+    COUNT. Compression follows Accept-Encoding.
+    """
+    renderer_classes = [CSVRenderer, NDJSONRenderer]
+    pagination_class = None
+    
+    def list(self, request, *args, **kwargs):
+        export_format = request.accepted_renderer.format
+        queryset = self.get_queryset().select_related(None).order_by('region_id', 'parameter_id', 'year', 'month')
+        response = StreamingHttpResponse(
+            EXPORT_STREAMS[export_format](queryset),
+            content_type=request.accepted_renderer.media_type,
+        )
+        response['Content-Disposition'] = f'attachment; filename="weather-data.{export_format}"'
+        return response
 
 class WeatherDataDetailView(generics.RetrieveAPIView):
     """Get specific weather data record"""
     queryset = WeatherData.objects.select_related('region', 'parameter')
     serializer_class = WeatherDataSerializer
+    
+    def retrieve(self, request, *args, **kwargs):
+        row = WeatherData.objects.filter(pk=kwargs['pk']).values(*WEATHER_DATA_VALUES).first()
+        if row is None:
+            raise NotFound()
+        return Response(serialize_weather_rows([row])[0])
 
 @method_decorator(csrf_exempt, name='dispatch')
 class ParseDataView(APIView):
@@ -80,24 +155,63 @@ class ParseDataView(APIView):
     permission_classes = [IsAuthenticated]
     
     def post(self, request):
-        parser = MetOfficeParser()
-        
         region = request.data.get('region', None)
         parameter = request.data.get('parameter', None)
+        force = str(request.data.get('force', '')).lower() in ('1', 'true', 'yes')
+        sync = str(request.data.get('sync', '')).lower() in ('1', 'true', 'yes')
+        try:
+            workers = max(1, int(request.data.get('workers', 1 if sync else PARSE_JOB_WORKERS)))
+        except (TypeError, ValueError):
+            return Response(
+                {'success': False, 'message': 'workers must be an integer'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if sync:
+            return self._parse_inline(region, parameter, force, workers)
+        
+        if region and parameter:
+            pairs = [(region, parameter)]
+        else:
+            pairs = [
+                (region_code, parameter_code)
+                for region_code in MetOfficeParser.REGIONS.keys()
+                for parameter_code in MetOfficeParser.PARAMETERS.keys()
+            ]
+        job = start_parse_job(pairs, force=force, workers=workers)
+        
+        return Response({
+            'success': True,
+            'job_id': str(job.id),
+            'status_url': reverse('weather:api-parse-job', kwargs={'pk': job.id}),
+            'total_pairs': job.total_pairs,
+            'message': f'Queued parsing of {job.total_pairs} region/parameter pair(s)'
+        }, status=status.HTTP_202_ACCEPTED)
+    
+    def _parse_inline(self, region, parameter, force, workers):
+        """Run parsing inside the request, as before background jobs existed"""
+        parser = MetOfficeParser()
         
         if region and parameter:
             # Parse specific region and parameter
-            result = parser.parse_and_save(region, parameter)
+            result = parser.parse_and_save(region, parameter, force=force)
             return Response(result)
         else:
             # Parse all data
-            results = parser.parse_all_data()
+            results = parser.parse_all_data(workers=workers, force=force)
             return Response({
                 'success': True,
                 'message': 'Data parsing completed',
                 'results': results
             })
 
+class ParseJobDetailView(generics.RetrieveAPIView):
+    """Progress and per-pair results of a background parse job"""
+    authentication_classes = [SessionAuthentication, BasicAuthentication]
+    permission_classes = [IsAuthenticated]
+    queryset = ParseJob.objects.all()
+    serializer_class = ParseJobSerializer
+
 class WeatherSummaryView(APIView):
     """Get weather data summary with statistics"""
     
@@ -106,58 +220,216 @@ class WeatherSummaryView(APIView):
         region = request.query_params.get('region', 'UK')  # Default to UK
         parameter = request.query_params.get('parameter', 'Tmean')  # Default to Tmean
         
-        # Get base queryset
-        queryset = WeatherData.objects.select_related('region', 'parameter')
+        year_from = _year_param(request, 'year_from')
+        year_to = _year_param(request, 'year_to')
         
-        # Apply filters
-        if region:
-            queryset = queryset.filter(region__code=region)
-        if parameter:
-            queryset = queryset.filter(parameter__code=parameter)
+        def build():
+            # Annual statistics straight from the in-process series arrays
+            summary = yearly_summary(chain.from_iterable(
+                arrays.annual_rows(year_from, year_to) for arrays in store.select(region, parameter)
+            ))
+            
+            # Get list of unique regions and parameters
+            region_table, parameter_table = metadata.tables()
+            regions = [{'code': code, 'name': name} for name, code in region_table.values()]
+            parameters = [{'code': code, 'name': name, 'unit': unit} for name, code, unit in parameter_table.values()]
+            
+            # Format the response data
+            response_data = {
+                'total_records': summary['total_records'],
+                'data_range': summary['data_range'],
+                'regions': regions,
+                'parameters': parameters,
+                'summary': [
+                    {
+                        'year': str(year),
+                        'avg_value': round(float(avg_value), 2)
+                    }
+                    for year, avg_value in summary['yearly']
+                ]
+            }
+            
+            return response_data
         
-        # Get total records count
-        total_records = queryset.count()
+        return cached_response(request, 'summary', region, parameter, build)
+
+class SeriesBatchView(APIView):
+    """
+    Load several series in one request
+    
+    POST {"series": [{"region", "parameter", "year_from", "year_to", "aggregation"}, ...]}
+    with aggregation one of monthly, annual, seasonal or climatology.
+    """
+    
+    def post(self, request):
+        serializer = SeriesBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        specs = serializer.validated_data['series']
+        key = [
+            (spec['region'], spec['parameter'], spec.get('year_from'), spec.get('year_to'), spec['aggregation'],
+             spec.get('max_points'), spec['downsample'])
+            for spec in specs
+        ]
         
-        # Get data range
-        data_range = queryset.aggregate(
-            min_year=Min('year'),
-            max_year=Max('year'),
-            min_value=Min('value'),
-            max_value=Max('value'),
-            avg_value=Avg('value')
-        )
+        def build():
+            return {'series': load_series(specs)}
         
-        # Get list of unique regions and parameters
-        regions = list(WeatherRegion.objects.values('code', 'name').distinct())
-        parameters = list(WeatherParameter.objects.values('code', 'name', 'unit').distinct())
-        
-        # Get yearly averages for the selected region and parameter
-        yearly_avg = queryset.values('year').annotate(
-            avg_value=Avg('value')
-        ).order_by('year')
-        
-        # Format the response data
-        response_data = {
-            'total_records': total_records,
-            'data_range': {
-                'min_year': data_range['min_year'],
-                'max_year': data_range['max_year'],
-                'min_value': data_range['min_value'],
-                'max_value': data_range['max_value'],
-                'avg_value': data_range['avg_value']
-            },
-            'regions': regions,
-            'parameters': parameters,
-            'summary': [
-                {
-                    'year': str(item['year']),
-                    'avg_value': round(float(item['avg_value']), 2)
-                }
-                for item in yearly_avg
-            ]
-        }
+        return cached_response(request, 'series-batch', None, None, build, key=key)
+
+class AnomalyView(APIView):
+    """
+    Monthly anomalies against a baseline climatology
+    
+    ?baseline_from / ?baseline_to (default 1961-1990), ?windows=12&windows=36
+    (default 12, 36 and 120 months) and ?year_from / ?year_to to limit the
+    returned months. Cached per series and query, invalidated on re-ingest.
+    """
+    
+    def get(self, request):
+        serializer = AnomalyQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        region, parameter = params['region'], params['parameter']
+        
+        def build():
+            result = anomaly_series(
+                store.get(region, parameter),
+                baseline=(params['baseline_from'], params['baseline_to']),
+                windows=params['windows'],
+                year_from=params.get('year_from'),
+                year_to=params.get('year_to'),
+            )
+            return {'region': region, 'parameter': parameter, **result}
+        
+        return cached_response(request, 'anomalies', region, parameter, build)
+
+class TrendView(APIView):
+    """
+    Least-squares trends per calendar month and per season
+    
+    ?year_from / ?year_to bound the fit, ?rolling_window=30 adds the trend
+    of every trailing 30-year window and ?change_points=true a single
+    mean-shift change point per period. Cached until the series is
+    re-ingested.
+    """
+    
+    def get(self, request):
+        serializer = TrendQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        region, parameter = params['region'], params['parameter']
+        
+        def build():
+            report = trend_report(
+                store.get(region, parameter),
+                year_from=params.get('year_from'),
+                year_to=params.get('year_to'),
+                rolling_window=params.get('rolling_window'),
+                detect_change_points=params['change_points'],
+            )
+            return {'region': region, 'parameter': parameter, **report}
+        
+        return cached_response(request, 'trends', region, parameter, build)
+
+class RegionComparisonView(APIView):
+    """
+    Aligned region x month matrix and pairwise statistics for one parameter
+    
+    ?regions=England&regions=Scotland (default: every region with data),
+    ?year_from / ?year_to for the window, ?lag=N to pair each row region
+    with the column region N months earlier and ?anomalies=true to compare
+    deviations from each region's monthly means. ?include_series=false
+    leaves out the aligned values.
+    """
+    
+    def get(self, request):
+        serializer = CompareQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        parameter = params['parameter']
+        
+        def build():
+            # Every series of the parameter comes from one grouped query
+            loaded = {key[0]: arrays for key, arrays in store.items(parameter=parameter)}
+            codes = params.get('regions') or sorted(loaded)
+            result = region_comparison(
+                {code: loaded.get(code) for code in codes},
+                year_from=params.get('year_from'),
+                year_to=params.get('year_to'),
+                lag=params['lag'],
+                anomalies=params['anomalies'],
+                include_series=params['include_series'],
+            )
+            return {'parameter': parameter, **result}
+        
+        return cached_response(request, 'compare', None, parameter, build)
+
+class RankView(APIView):
+    """
+    Rank and percentile of a month within the record of its calendar month
+    
+    ?month=6&year=2012 ranks June 2012 among all Junes, ?month=6&value=150
+    ranks an arbitrary value and without either the latest month of the
+    series is ranked. ?top=N (default 3) lists the N highest and lowest
+    records. Answered by binary search over the store's per-month sorted
+    index; cached until the series is re-ingested.
+    """
+    
+    def get(self, request):
+        serializer = RankQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        region, parameter = params['region'], params['parameter']
+        
+        def build():
+            report = rank_report(
+                store.get(region, parameter),
+                month=params.get('month'),
+                year=params.get('year'),
+                value=params.get('value'),
+                top=params['top'],
+            )
+            return {'region': region, 'parameter': parameter, **report}
+        
+        return cached_response(request, 'rank', region, parameter, build)
+
+class AgroclimateView(APIView):
+    """
+    Yearly agroclimatic indices per region
+    
+    Growing degree days, frost-risk months, rainfall/sunshine ratio,
+    Thornthwaite PET and water balance, read from the AgroclimateIndex
+    table that ingestion keeps up to date. ?region (default: every region)
+    and ?year_from / ?year_to filter the rows. Cached until one of the
+    input series is re-ingested.
+    """
+    
+    def get(self, request):
+        serializer = AgroclimateQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        region = params['region']
+        
+        def build():
+            indices = AgroclimateIndex.objects.all()
+            if region:
+                indices = indices.filter(region__code=region)
+            if params.get('year_from') is not None:
+                indices = indices.filter(year__gte=params['year_from'])
+            if params.get('year_to') is not None:
+                indices = indices.filter(year__lte=params['year_to'])
+            
+            regions = {}
+            for code, year, *values in indices.order_by('region__code', 'year').values_list(
+                'region__code', 'year', *INDEX_FIELDS
+            ):
+                series = regions.setdefault(code, {'years': [], **{field: [] for field in INDEX_FIELDS}})
+                series['years'].append(year)
+                for field, value in zip(INDEX_FIELDS, values):
+                    series[field].append(value)
+            return {'gdd_base': GDD_BASE, 'frost_risk_tmin': FROST_RISK_TMIN, 'regions': regions}
         
-        return Response(response_data)
+        return cached_response(request, 'agroclimate', region, None, build)
 
 class DataSourceListView(generics.ListAPIView):
     """List all data sources"""
@@ -189,27 +461,76 @@ def charts(request):
     """Charts and visualization view"""
     return render(request, 'weather/charts.html')
 
+def metrics(request):
+    """Request, SQL, cache and ingestion metrics of this process in the Prometheus text format"""
+    if not metrics_enabled():
+        raise Http404('Metrics are disabled, set WEATHER_METRICS_ENABLED')
+    return HttpResponse(registry.render(), content_type=METRICS_CONTENT_TYPE)
+
+def _year_param(request, name):
+    """Integer year query parameter, None when absent"""
+    value = request.GET.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValidationError({name: 'Must be a year'})
+
 @api_view(['GET'])
+@renderer_classes(series_renderers())
 def chart_data(request):
-    """API endpoint for chart data"""
+    """
+    API endpoint for chart data
+    
+    ?format=columnar returns the series as start_year/start_month plus a dense
+    value array (null for gaps), ?format=f32 as raw little-endian float32 and
+    ?format=arrow as an Arrow IPC stream.
+    
+    ?max_points=N downsamples longer series on the server with
+    Largest-Triangle-Three-Buckets, or per-bucket min/max with
+    ?downsample=minmax. Kept points keep their labels (or, in the columnar
+    formats, their month offsets). ?year_from and ?year_to limit the years.
+    """
     region = request.GET.get('region', 'UK')
     parameter = request.GET.get('parameter', 'Tmean')
+    year_from = _year_param(request, 'year_from')
+    year_to = _year_param(request, 'year_to')
+    downsample = request.GET.get('downsample', 'lttb')
+    if downsample not in DOWNSAMPLERS:
+        raise ValidationError({'downsample': f"Must be one of {', '.join(DOWNSAMPLERS)}"})
+    max_points = request.GET.get('max_points')
+    if max_points is not None:
+        try:
+            max_points = int(max_points)
+        except ValueError:
+            max_points = 0
+        if max_points < 3:
+            raise ValidationError({'max_points': 'Must be an integer of at least 3'})
     
-    data = WeatherData.objects.filter(
-        region__code=region,
-        parameter__code=parameter
-    ).order_by('year', 'month').values('year', 'month', 'value')
-    
-    # Format data for charts
-    chart_data = {
-        'labels': [],
-        'values': [],
-        'region': region,
-        'parameter': parameter
-    }
-    
-    for record in data:
-        chart_data['labels'].append(f"{record['year']}-{record['month']:02d}")
-        chart_data['values'].append(record['value'])
+    def build():
+        # Served from the in-process series arrays, no per-request query
+        arrays = store.get(region, parameter)
+        present = arrays.present(year_from, year_to) if arrays is not None else np.empty(0, dtype=np.int64)
+        
+        if request.accepted_renderer.format in COLUMNAR_FORMATS:
+            if not len(present):
+                return dense_series(region, parameter, None, None, np.empty(0))
+            first, last = int(present[0]), int(present[-1])
+            return dense_series(
+                region, parameter, arrays.start_year + first // 12, first % 12 + 1,
+                arrays.values[first:last + 1], max_points, downsample
+            )
+        
+        if max_points and len(present) > max_points:
+            present = present[DOWNSAMPLERS[downsample](present.astype(np.float64), arrays.values[present], max_points)]
+        
+        # Format data for charts
+        return {
+            'labels': [arrays.labels[offset] for offset in present] if len(present) else [],
+            'values': arrays.values[present].tolist() if len(present) else [],
+            'region': region,
+            'parameter': parameter
+        }
     
-    return Response(chart_data)
\ No newline at end of file
+    return cached_response(request, 'chart-data', region, parameter, build)
\ No newline at end of file